@@ -20,19 +20,15 @@ import os
 import re
 import argparse
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, TextIO
 from datetime import datetime
 import openpyxl
 
-# Add src to path for imports
-sys.path.append(os.path.join(os.getcwd(), 'src'))
+# Add src to path for imports (relative to this file so in-process callers work from any cwd)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
 from validation.scoring_engine import ProductScoringEngine
 from dataclasses import dataclass
 
-# Fix for Windows Unicode issues
-import io
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-
 
 @dataclass
 class ValidationResult:
@@ -54,14 +50,16 @@ class ExcelValidator:
     Compares original product names with scraped names.
     """
     
-    def __init__(self, threshold: float = 8.0):
+    def __init__(self, threshold: float = 8.0, output: Optional[TextIO] = None):
         """
         Initialize validator with score threshold.
         
         Args:
             threshold: Minimum score for valid match (default 8.0/10.0 = 80%)
+            output: Stream for progress messages (default: sys.stdout)
         """
         self.threshold = threshold
+        self.output = output
         self.scoring_engine = ProductScoringEngine()
         self.validation_results = []
         self.summary_stats = {
@@ -301,8 +299,8 @@ class ExcelValidator:
             True if validation completed successfully
         """
         try:
-            print(f"\n📊 Validating Excel file: {excel_path}")
-            print("=" * 60)
+            print(f"\n📊 Validating Excel file: {excel_path}", file=self.output)
+            print("=" * 60, file=self.output)
             
             # Load the Excel file
             wb = openpyxl.load_workbook(excel_path, read_only=True)
@@ -316,16 +314,16 @@ class ExcelValidator:
                     missing_sheets.append(sheet_name)
             
             if missing_sheets:
-                print(f"❌ Error: Missing required worksheets: {', '.join(missing_sheets)}")
-                print(f"📋 Found worksheets: {', '.join(wb.sheetnames)}")
-                print(f"📋 Required worksheets: {', '.join(required_sheets)}")
+                print(f"❌ Error: Missing required worksheets: {', '.join(missing_sheets)}", file=self.output)
+                print(f"📋 Found worksheets: {', '.join(wb.sheetnames)}", file=self.output)
+                print(f"📋 Required worksheets: {', '.join(required_sheets)}", file=self.output)
                 return False
             
-            print(f"✅ All 3 required worksheets found: {', '.join(required_sheets)}")
+            print(f"✅ All 3 required worksheets found: {', '.join(required_sheets)}", file=self.output)
             
             # Check if פירוט sheet exists
             if 'פירוט' not in wb.sheetnames:
-                print("❌ Error: 'פירוט' sheet not found in Excel file")
+                print("❌ Error: 'פירוט' sheet not found in Excel file", file=self.output)
                 return False
             
             sheet = wb['פירוט']
@@ -380,7 +378,7 @@ class ExcelValidator:
             return True
             
         except Exception as e:
-            print(f"❌ Error validating Excel file: {e}")
+            print(f"❌ Error validating Excel file: {e}", file=self.output)
             return False
     
     def create_validation_worksheet(self, excel_path: str) -> bool:
@@ -491,11 +489,11 @@ class ExcelValidator:
             wb.save(excel_path)
             wb.close()
             
-            print(f"📊 Validation worksheet '{validation_sheet_name}' created with {len(rejected_results)} rejected products")
+            print(f"📊 Validation worksheet '{validation_sheet_name}' created with {len(rejected_results)} rejected products", file=self.output)
             return True
             
         except Exception as e:
-            print(f"❌ Error creating validation worksheet: {e}")
+            print(f"❌ Error creating validation worksheet: {e}", file=self.output)
             return False
     
     def generate_report(self, output_path: Optional[str] = None) -> str:
@@ -594,7 +592,7 @@ class ExcelValidator:
         if output_path:
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(report_text)
-            print(f"\n📄 Report saved to: {output_path}")
+            print(f"\n📄 Report saved to: {output_path}", file=self.output)
         
         return report_text
 
@@ -662,4 +660,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Fix for Windows Unicode issues (command-line only, so importing this module leaves stdout alone)
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     main()
\ No newline at end of file
@@ -5,11 +5,26 @@ This module provides a clean API interface between the CLI and core scraping eng
 enabling modular architecture and multiple interface possibilities.
 """
 
-from .scraper_service import ScraperService
-from .validation_service import ValidationService  
-from .results_service import ResultsService
-from .status_service import StatusService
-from .summary_service import SummaryService
+import importlib
+
+# Services are imported on first access (PEP 562) so that using one of them
+# doesn't pull in the others' dependencies (openpyxl, psutil, ...).
+_SERVICE_MODULES = {
+    'ScraperService': '.scraper_service',
+    'ValidationService': '.validation_service',
+    'ResultsService': '.results_service',
+    'StatusService': '.status_service',
+    'SummaryService': '.summary_service',
+}
+
+
+def __getattr__(name):
+    module_name = _SERVICE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     'ScraperService',
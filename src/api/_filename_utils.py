@@ -0,0 +1,23 @@
+"""
+Report filename helpers shared by the API services.
+
+Output reports are named Lines_<rows>_Report_<timestamp>.xlsx; the services
+that list, summarize and validate them all need the <rows> token.
+"""
+
+import re
+from functools import lru_cache
+
+
+# Report filenames: Lines_126_Report_... or Lines_126-127_Report_... (any case, since
+# the output directory is listed case-insensitively on Windows)
+_LINES_RE = re.compile(r'Lines_([0-9-]+)_Report_', re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def extract_rows_from_filename(filename: str) -> str:
+    """Extract the processed-rows token from a report filename (cached per filename)."""
+    match = _LINES_RE.search(filename)
+    if match:
+        return match.group(1)
+    return "unknown"
@@ -10,7 +10,8 @@ import glob
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
-import openpyxl
+
+from ._filename_utils import extract_rows_from_filename
 
 
 class ResultsService:
@@ -63,6 +64,9 @@ class ResultsService:
     
     def _analyze_excel_file(self, file_path: str) -> Dict[str, Any]:
         """Analyze Excel file and extract key information."""
+        # Deferred so CLI startup does not pay for openpyxl until results are viewed
+        import openpyxl
+        
         try:
             workbook = openpyxl.load_workbook(file_path, read_only=True)
             
@@ -101,13 +105,14 @@ class ResultsService:
         """Extract price information from details sheet."""
         try:
             prices = []
+            _cell = sheet.cell
             
             # Assuming price columns are around G-I (ZAP price, difference, etc.)
             for row in range(2, min(sheet.max_row + 1, 100)):  # Limit to avoid huge files
                 try:
                     # Try to find price cells (looking for ₪ symbol or numeric values)
                     for col in range(6, 12):  # Columns F-K
-                        cell_value = sheet.cell(row=row, column=col).value
+                        cell_value = _cell(row, col).value
                         if cell_value and isinstance(cell_value, (int, float)) and cell_value > 0:
                             prices.append(float(cell_value))
                             break
@@ -131,23 +136,25 @@ class ResultsService:
         """Extract information from summary sheet."""
         try:
             summary_data = {}
+            _cell = sheet.cell
+            max_col = min(sheet.max_column + 1, 10)
             
             # Read first few rows for summary statistics
             for row in range(1, min(sheet.max_row + 1, 5)):
-                for col in range(1, min(sheet.max_column + 1, 10)):
-                    cell_value = sheet.cell(row=row, column=col).value
+                for col in range(1, max_col):
+                    cell_value = _cell(row, col).value
                     if cell_value and isinstance(cell_value, str):
                         # Look for key metrics
                         if "vendor" in cell_value.lower():
                             try:
-                                next_cell = sheet.cell(row=row, column=col+1).value
+                                next_cell = _cell(row, col + 1).value
                                 if isinstance(next_cell, (int, float)):
                                     summary_data["summary_vendor_count"] = int(next_cell)
                             except:
                                 pass
                         elif "success" in cell_value.lower() or "rate" in cell_value.lower():
                             try:
-                                next_cell = sheet.cell(row=row, column=col+1).value
+                                next_cell = _cell(row, col + 1).value
                                 if isinstance(next_cell, (int, float)):
                                     summary_data["success_rate"] = float(next_cell)
                             except:
@@ -160,12 +167,7 @@ class ResultsService:
     
     def _extract_rows_from_filename(self, filename: str) -> str:
         """Extract row information from Excel filename."""
-        import re
-        # Pattern: Lines_126_Report_... or Lines_126-127_Report_...
-        match = re.search(r'Lines_([0-9-]+)_Report_', filename)
-        if match:
-            return match.group(1)
-        return "unknown"
+        return extract_rows_from_filename(filename)
     
     def open_excel_file(self, file_path: str) -> bool:
         """
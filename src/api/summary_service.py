@@ -5,20 +5,173 @@ This service provides rich, formatted summaries of scraping operations
 for display in the CLI after processing completion.
 """
 
+import copy
 import os
-import openpyxl
+import re
+import math
+import json
+import time
+import hashlib
+from collections import Counter, OrderedDict
+from functools import lru_cache
 from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 
+from ._filename_utils import extract_rows_from_filename
+
+try:
+    # Optional Rust-backed XLSX reader; openpyxl is used when it is not installed
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+
+def _calamine_rows(sheet, min_row: int = 1, max_row: Optional[int] = None, max_col: int = 1):
+    """
+    Yield fixed-width value tuples from a calamine sheet, matching openpyxl's
+    iter_rows(values_only=True): empty cells are None and whole numbers are int.
+    """
+    for row in sheet.to_python(skip_empty_area=False, nrows=max_row)[min_row - 1:]:
+        values = [
+            None if value == "" else int(value) if isinstance(value, float) and value.is_integer() else value
+            for value in row[:max_col]
+        ]
+        values.extend([None] * (max_col - len(values)))
+        yield tuple(values)
+
+
+# Resolved once per process rather than per service instance
+_PROJECT_ROOT = Path(__file__).parents[2]
+_OUTPUT_DIR = _PROJECT_ROOT / "output"
+
+@lru_cache(maxsize=1)
+def _format_timestamp(epoch: float) -> str:
+    """Format an epoch timestamp for display (the same file is usually shown repeatedly)."""
+    return datetime.fromtimestamp(epoch).strftime('%Y-%m-%d %H:%M:%S')
+
+
+# Strips currency symbols and thousands separators from price strings like "₪10,970.0"
+_PRICE_RE = re.compile(r"[^\d.\-]")
+
+@lru_cache(maxsize=256)
+def _line_numbers_for(rows_processed: str, product_count: int) -> Tuple[str, ...]:
+    """Expand a processed-rows token into display line numbers (cached per input)."""
+    if not rows_processed or rows_processed == "unknown":
+        # Generate sequential numbers starting from 2
+        return tuple(str(i + 2) for i in range(product_count))
+    
+    # Handle different formats
+    token = str(rows_processed)
+    if '-' in token:
+        # Range format like "126-127" or "2-18-125-61"
+        parts = token.split('-')
+        if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
+            # Simple range like "126-127"
+            return tuple(map(str, range(int(parts[0]), int(parts[1]) + 1)))
+        else:
+            # Complex format like "2-18-125-61" - use all parts
+            return tuple(part for part in parts if part.isdigit())
+    elif token.isdigit():
+        # Single number
+        return (token,)
+    
+    # Fallback
+    return tuple(str(i + 2) for i in range(product_count))
+
+
+# Shared summary layout pieces
+_BORDER = "=" * 80
+_PRODUCTS_TABLE_HEADER = (
+    "| Line | Product Name                 | Vendors | Model ID | Cheapest Price |",
+    "|------|------------------------------|---------|----------|----------------|",
+)
+# Row template matching the table header above
+_PRODUCTS_ROW_TMPL = "| {line:>4} | {name:<28} | {vendors:>7} | {model:>8} | {price:>14} |"
+
+
+def _fmt_price(value) -> str:
+    """Format a cheapest-price cell for the products table (missing or zero shows as ₪0)."""
+    return f"₪{value:,.0f}" if value and value > 0 else "₪0"
+
+
+# Processing efficiency weights: validation, data, coverage, price
+_EFFICIENCY_WEIGHTS = (0.3, 0.25, 0.25, 0.2)
+
+# Recommendation rules: (insights section, metric, default, predicate, message), in display order
+_RECOMMENDATION_RULES = (
+    ("quality_indicators", "validation_success_rate", 0, lambda v: v < 80,
+     "Consider reviewing product name formatting for better validation"),
+    ("market_coverage", "market_depth", 0, lambda v: v < 5,
+     "Limited vendor options found - consider expanding search criteria"),
+    ("market_coverage", "market_depth", 0, lambda v: v > 20,
+     "Excellent vendor coverage - high competition benefits buyers"),
+    ("market_coverage", "price_efficiency", 0, lambda v: v > 0.8,
+     "Good price spread detected - significant savings opportunities available"),
+    ("market_coverage", "price_efficiency", 0, lambda v: v < 0.4,
+     "Limited price variation - market may have price stability"),
+    ("competitive_intelligence", "manufacturer_diversity", 0, lambda v: v > 1,
+     "Multi-manufacturer comparison available - cross-brand analysis recommended"),
+    ("competitive_intelligence", "technology_features", (), lambda v: "Inverter Technology" in v,
+     "Inverter technology detected - energy efficiency focus recommended"),
+)
+
+# Summary-sheet model IDs are 6+ digit numbers
+_MODEL_ID_RE = re.compile(r"\d{6,}")
+# A success rate is only read from a summary row carrying one of these labels
+_SUCCESS_RATE_LABELS = ("הצלחה", "validation")
+
+# Product-name markers used by the competitive landscape analysis, in precedence order.
+# "INV" also covers "INVERTER" (INV ≡ INVERTER).
+_MANUFACTURER_MARKERS = (
+    ("ELECTRA", ("Electra", "אלקטרה")),
+    ("TORNADO", ("Tornado", "טורנדו")),
+    ("TADIRAN", ("Tadiran", "תדיראן")),
+)
+_SERIES_MARKERS = (
+    ("WD-series", "WD-"),
+    ("INV-series", "INV"),
+    ("TOP-PRO", "TOP-PRO"),
+)
+_TECHNOLOGY_MARKERS = (
+    ("Inverter Technology", "INV"),
+    ("3-Phase Power", "3PH"),
+    ("Window/Wall Mount", "WD-"),
+)
+# The stress-test summary only recognises the English manufacturer names, first match wins
+_STRESS_MANUFACTURER_MARKERS = (
+    ("Electra", "ELECTRA"),
+    ("Tornado", "TORNADO"),
+)
+# Single alternation so each product name is scanned once for every marker
+_MARKER_RE = re.compile("|".join(map(re.escape, sorted(
+    {token for _, tokens in _MANUFACTURER_MARKERS for token in tokens}
+    | {token for _, token in _SERIES_MARKERS}
+    | {token for _, token in _TECHNOLOGY_MARKERS},
+    key=len, reverse=True
+))))
+
 
 class SummaryService:
     """Service class for generating post-processing summaries."""
     
-    def __init__(self):
-        """Initialize summary service."""
-        self.project_root = Path(__file__).parent.parent.parent
-        self.output_dir = self.project_root / "output"
+    # Maximum number of formatted displays kept when display caching is enabled
+    DISPLAY_CACHE_SIZE = 16
+    # Maximum number of generated summaries kept, keyed by file identity and operation type
+    SUMMARY_CACHE_SIZE = 16
+    
+    def __init__(self, cache_display: bool = False):
+        """
+        Initialize summary service.
+        
+        Args:
+            cache_display: Reuse formatted displays for identical summary inputs
+        """
+        self.project_root = _PROJECT_ROOT
+        self.output_dir = _OUTPUT_DIR
+        self.cache_display = cache_display
+        self._display_cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._summary_cache: "OrderedDict[Tuple[str, int, int, str], Dict[str, Any]]" = OrderedDict()
     
     def generate_post_processing_summary(self, excel_file_path: str, operation_type: str = "batch") -> Dict[str, Any]:
         """
@@ -36,9 +189,19 @@ class SummaryService:
             if os.path.basename(excel_file_path).startswith('~$'):
                 return {"error": "Skipping temporary Excel file"}
             
-            if not os.path.exists(excel_file_path):
+            try:
+                file_stat = os.stat(excel_file_path)
+            except OSError:
                 return {"error": f"Excel file not found: {excel_file_path}"}
             
+            # Unchanged files (same mtime and size) reuse the previous summary
+            cache_key = (excel_file_path, file_stat.st_mtime_ns, file_stat.st_size, operation_type)
+            cached_summary = self._summary_cache.get(cache_key)
+            if cached_summary is not None:
+                self._summary_cache.move_to_end(cache_key)
+                # Callers own the dict they get back; keep the cached copy pristine
+                return copy.deepcopy(cached_summary)
+            
             # Extract basic file info
             file_info = self._extract_file_info(excel_file_path)
             if "error" in file_info:
@@ -61,6 +224,10 @@ class SummaryService:
                 "formatted_display": self._format_summary_display(file_info, excel_analysis, operation_insights, operation_type)
             }
             
+            self._summary_cache[cache_key] = copy.deepcopy(summary)
+            if len(self._summary_cache) > self.SUMMARY_CACHE_SIZE:
+                self._summary_cache.popitem(last=False)
+            
             return summary
             
         except Exception as e:
@@ -71,29 +238,28 @@ class SummaryService:
         """Extract basic file information."""
         try:
             file_stat = os.stat(excel_file_path)
-            file_size_kb = file_stat.st_size // 1024
-            created_time = datetime.fromtimestamp(file_stat.st_ctime)
-            
-            # Extract row information from filename
             filename = os.path.basename(excel_file_path)
-            rows_processed = self._extract_rows_from_filename(filename)
             
             return {
                 "filename": filename,
                 "file_path": excel_file_path,
-                "file_size_kb": file_size_kb,
-                "created_time": created_time,
-                "rows_processed": rows_processed
+                "file_size_kb": file_stat.st_size // 1024,
+                "created_time_epoch": file_stat.st_ctime,
+                "created_time_str": _format_timestamp(file_stat.st_ctime),
+                # Extract row information from filename
+                "rows_processed": self._extract_rows_from_filename(filename)
             }
             
         except Exception as e:
             # Return basic info even if some extraction fails
             filename = os.path.basename(excel_file_path) if excel_file_path else "Unknown"
+            now = time.time()
             return {
                 "filename": filename,
                 "file_path": excel_file_path or "Unknown",
                 "file_size_kb": 0,
-                "created_time": datetime.now(),
+                "created_time_epoch": now,
+                "created_time_str": _format_timestamp(now),
                 "rows_processed": "unknown",
                 "extraction_error": str(e)
             }
@@ -101,44 +267,74 @@ class SummaryService:
     def _analyze_excel_content(self, excel_file_path: str) -> Dict[str, Any]:
         """Analyze Excel file content for summary metrics."""
         try:
-            workbook = openpyxl.load_workbook(excel_file_path, read_only=True)
-            
-            analysis = {
-                "worksheets": list(workbook.sheetnames),
-                "total_vendors": 0,
-                "validated_vendors": 0,
-                "price_range": {"min": None, "max": None, "avg": None},
-                "model_ids": [],
-                "products": [],
-                "validation_success_rate": 0.0
-            }
+            if CalamineWorkbook is not None:
+                workbook = CalamineWorkbook.from_path(excel_file_path)
+                try:
+                    return self._analyze_workbook_rows(
+                        workbook.sheet_names,
+                        lambda name, **bounds: _calamine_rows(workbook.get_sheet_by_name(name), **bounds)
+                    )
+                finally:
+                    workbook.close()
             
-            # Analyze פירוט (Details) worksheet
-            if "פירוט" in workbook.sheetnames:
-                details_analysis = self._analyze_details_sheet(workbook["פירוט"])
-                analysis.update(details_analysis)
+            # Deferred so CLI startup does not pay for openpyxl until a summary is generated
+            import openpyxl
             
-            # Analyze סיכום (Summary) worksheet  
-            if "סיכום" in workbook.sheetnames:
-                summary_analysis = self._analyze_summary_sheet(workbook["סיכום"])
-                analysis.update(summary_analysis)
-                
-                # Update products with model IDs from summary sheet
-                model_ids = summary_analysis.get("model_ids", [])
-                products = analysis.get("products", [])
-                
-                for i, product in enumerate(products):
-                    if i < len(model_ids):
-                        product["model_id"] = model_ids[i]
-            
-            workbook.close()
-            return analysis
+            workbook = openpyxl.load_workbook(excel_file_path, read_only=True, data_only=True)
+            try:
+                return self._analyze_workbook_rows(
+                    workbook.sheetnames,
+                    lambda name, **bounds: workbook[name].iter_rows(values_only=True, **bounds)
+                )
+            finally:
+                # Read-only workbooks hold the file open until closed
+                workbook.close()
             
         except Exception as e:
             return {"error": f"Failed to analyze Excel content: {e}"}
     
-    def _analyze_details_sheet(self, sheet) -> Dict[str, Any]:
-        """Analyze the פירוט (Details) worksheet."""
+    def _analyze_workbook_rows(self, sheetnames: List[str], read_rows) -> Dict[str, Any]:
+        """
+        Analyze workbook sheets independently of the XLSX reader.
+        
+        Args:
+            sheetnames: Worksheet names in the workbook
+            read_rows: Callable(name, min_row=, max_row=, max_col=) yielding value tuples
+        """
+        analysis = {
+            "worksheets": list(sheetnames),
+            "total_vendors": 0,
+            "validated_vendors": 0,
+            "price_range": {"min": None, "max": None, "avg": None},
+            "model_ids": [],
+            "products": [],
+            "validation_success_rate": 0.0
+        }
+        
+        # Analyze פירוט (Details) worksheet
+        if "פירוט" in sheetnames:
+            details_analysis = self._analyze_details_sheet(read_rows("פירוט", min_row=2, max_col=4))
+            analysis.update(details_analysis)
+        
+        # Analyze סיכום (Summary) worksheet  
+        if "סיכום" in sheetnames:
+            products = analysis.get("products", [])
+            summary_analysis = self._analyze_summary_sheet(
+                read_rows("סיכום", min_row=1, max_row=19, max_col=9), len(products) or None
+            )
+            analysis.update(summary_analysis)
+            
+            # Update products with model IDs from summary sheet
+            model_ids = summary_analysis.get("model_ids", [])
+            
+            for i, product in enumerate(products):
+                if i < len(model_ids):
+                    product["model_id"] = model_ids[i]
+        
+        return analysis
+    
+    def _analyze_details_sheet(self, rows) -> Dict[str, Any]:
+        """Analyze the פירוט (Details) worksheet from its data rows (columns A-D, header excluded)."""
         try:
             analysis = {
                 "total_vendors": 0,
@@ -147,87 +343,98 @@ class SummaryService:
                 "model_ids": []
             }
             
-            prices = []
+            # Running price aggregates (single pass, no per-price list)
+            p_min = math.inf
+            p_max = -math.inf
+            p_sum = 0.0
+            p_n = 0
             products_seen = set()
             model_ids_seen = set()
             
             # Hebrew Excel format: שורת מקור (A), שם מוצר (B), מחיר (C), שם ספק (D), שם מוצר באתר הספק (E)
             products_data = {}  # line_number -> product info
+            total_vendors = 0
             
-            # Parse all data rows (skip header row 1)
-            for row in range(2, sheet.max_row + 1):
+            # Vendor rows for the same source line are written consecutively, so the
+            # current record is reused until the line number changes
+            last_line_number = None
+            record = None
+            
+            # Parse all data rows in a single streaming sweep; per-cell lookups
+            # re-parse the sheet XML in openpyxl read-only mode
+            for line_number, product_name, price_cell, vendor_name in rows:
                 try:
                     # Column A: Line number (שורת מקור)
-                    line_number = sheet.cell(row=row, column=1).value
                     if not line_number:
                         continue
                     
                     # Column B: Product name (שם מוצר) 
-                    product_name = sheet.cell(row=row, column=2).value
                     if not product_name:
                         continue
                     
                     # Column C: Price (מחיר)
-                    price_cell = sheet.cell(row=row, column=3).value
                     price = None
                     if price_cell:
                         # Handle price format like "₪10,970.0"
-                        if isinstance(price_cell, str):
-                            price_str = price_cell.replace("₪", "").replace(",", "")
-                            try:
-                                price = float(price_str)
-                            except:
-                                pass
-                        elif isinstance(price_cell, (int, float)):
-                            price = float(price_cell)
-                    
-                    # Column D: Vendor name (שם ספק)
-                    vendor_name = sheet.cell(row=row, column=4).value
+                        try:
+                            price = float(_PRICE_RE.sub("", price_cell)) if isinstance(price_cell, str) else float(price_cell)
+                        except (TypeError, ValueError):
+                            price = None
                     
                     if price and price > 0:
-                        prices.append(price)
+                        if price < p_min:
+                            p_min = price
+                        if price > p_max:
+                            p_max = price
+                        p_sum += price
+                        p_n += 1
                     
+                    # Column D: Vendor name (שם ספק)
                     if vendor_name:
-                        analysis["total_vendors"] += 1
+                        total_vendors += 1
                     
-                    # Group by line number
-                    line_key = str(line_number)
-                    if line_key not in products_data:
-                        products_data[line_key] = {
-                            "name": product_name,
-                            "line_number": line_number,
-                            "vendors": [],
-                            "prices": []
-                        }
+                    # Group by line number, aggregating vendor count and cheapest price in place
+                    if record is None or line_number != last_line_number:
+                        line_key = str(line_number)
+                        record = products_data.get(line_key)
+                        if record is None:
+                            record = products_data[line_key] = {
+                                "name": product_name,
+                                "line_number": line_number,
+                                "vendor_count": 0,
+                                "cheapest_price": math.inf
+                            }
+                        last_line_number = line_number
                     
                     # Add vendor and price info
                     if vendor_name:
-                        products_data[line_key]["vendors"].append(vendor_name)
-                    if price and price > 0:
-                        products_data[line_key]["prices"].append(price)
+                        record["vendor_count"] += 1
+                    if price and 0 < price < record["cheapest_price"]:
+                        record["cheapest_price"] = price
                         
                 except Exception:
                     continue
             
+            analysis["total_vendors"] = total_vendors
+            
             # Convert to products list with proper vendor counts and cheapest prices
-            for line_key, product_info in products_data.items():
-                cheapest_price = min(product_info["prices"]) if product_info["prices"] else None
-                vendor_count = len(product_info["vendors"])
-                
-                analysis["products"].append({
-                    "name": product_info["name"],
-                    "line_number": product_info["line_number"],
-                    "vendor_count": vendor_count,
-                    "cheapest_price": cheapest_price,
+            analysis["products"] = [
+                {
+                    "name": record["name"],
+                    "line_number": record["line_number"],
+                    "vendor_count": record["vendor_count"],
+                    "cheapest_price": record["cheapest_price"] if record["cheapest_price"] != math.inf else None,
                     "model_id": "Unknown"  # Will be updated from summary sheet
-                })
+                }
+                for record in products_data.values()
+            ]
             
             # Calculate price statistics
-            if prices:
+            if p_n:
                 analysis["price_range"] = {
-                    "min": min(prices),
-                    "max": max(prices),
-                    "avg": sum(prices) / len(prices)
+                    "min": p_min,
+                    "max": p_max,
+                    "avg": p_sum / p_n
                 }
             else:
                 analysis["price_range"] = {
@@ -243,26 +450,39 @@ class SummaryService:
         except Exception as e:
             return {"error": f"Failed to analyze details sheet: {e}"}
     
-    def _analyze_summary_sheet(self, sheet) -> Dict[str, Any]:
-        """Analyze the סיכום (Summary) worksheet."""
+    def _analyze_summary_sheet(self, rows, expected_models: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Analyze the סיכום (Summary) worksheet.
+        
+        Args:
+            rows: Value tuples for the scanned area (rows 1-19, columns A-I)
+            expected_models: Stop scanning once this many model IDs and a success rate are found
+        """
         try:
             analysis = {"validation_success_rate": 0.0, "model_ids": []}
             model_ids_found = []
+            found_rate = False
             
             # Look for model IDs and validation success rate in summary sheet
-            for row in range(1, min(sheet.max_row + 1, 20)):
-                for col in range(1, min(sheet.max_column + 1, 10)):
-                    cell_value = sheet.cell(row=row, column=col).value
+            for row in rows:
+                rate_row = not found_rate and any(
+                    isinstance(value, str) and any(label in value.lower() for label in _SUCCESS_RATE_LABELS)
+                    for value in row
+                )
+                for cell_value in row:
                     if cell_value:
                         # Look for model IDs (7-digit numbers)
-                        if isinstance(cell_value, (int, str)):
-                            model_str = str(cell_value)
-                            if model_str.isdigit() and len(model_str) >= 6:
-                                model_ids_found.append(model_str)
-                        # Look for percentage values that might be success rates
-                        elif isinstance(cell_value, (int, float)):
-                            if 0 <= cell_value <= 100:
-                                analysis["validation_success_rate"] = float(cell_value)
+                        if isinstance(cell_value, (int, str)) and _MODEL_ID_RE.fullmatch(str(cell_value)):
+                            model_ids_found.append(str(cell_value))
+                        # First percentage value on a labelled row is the success rate
+                        elif (rate_row and not found_rate and isinstance(cell_value, (int, float))
+                              and not isinstance(cell_value, bool) and 0 <= cell_value <= 100):
+                            analysis["validation_success_rate"] = float(cell_value)
+                            found_rate = True
+                
+                # Every expected field is populated - skip the remaining rows
+                if found_rate and expected_models and len(model_ids_found) >= expected_models:
+                    break
             
             analysis["model_ids"] = model_ids_found
             return analysis
@@ -293,10 +513,13 @@ class SummaryService:
             total_vendors, price_range, products, validation_rate, operation_type
         )
         
-        # Competitive Intelligence
-        insights["competitive_intelligence"] = self._analyze_competitive_landscape(
-            products, price_range, model_ids
-        )
+        # Competitive Intelligence (single-product runs have nothing to compare across)
+        if operation_type == "single" and len(products) <= 1:
+            insights["competitive_intelligence"] = self._single_product_landscape(products)
+        else:
+            insights["competitive_intelligence"] = self._analyze_competitive_landscape(
+                products, price_range, model_ids
+            )
         
         # Enhanced Achievements with intelligence
         achievements = self._generate_intelligent_achievements(
@@ -390,32 +613,42 @@ class SummaryService:
         """Analyze competitive landscape and market dynamics."""
         intelligence = {}
         
-        # Manufacturer diversity analysis
-        manufacturers = set()
-        series_analysis = {}
+        # Manufacturer diversity, series and technology analysis in a single pass.
+        # Manufacturers are few and fixed, so they are tracked as bit flags
+        # (bit i = _MANUFACTURER_MARKERS[i]).
+        manufacturer_flags = 0
+        series_analysis = Counter()
+        tech_indicators = []
         
         for product in products:
-            name = product.get("name", "")
+            markers = set(_MARKER_RE.findall(product.get("name", "")))
+            if not markers:
+                continue
             
             # Extract manufacturers
-            if "Electra" in name or "אלקטרה" in name:
-                manufacturers.add("ELECTRA")
-            elif "Tornado" in name or "טורנדו" in name:
-                manufacturers.add("TORNADO")
-            elif "Tadiran" in name or "תדיראן" in name:
-                manufacturers.add("TADIRAN")
+            for bit, (_, tokens) in enumerate(_MANUFACTURER_MARKERS):
+                if not markers.isdisjoint(tokens):
+                    manufacturer_flags |= 1 << bit
+                    break
             
             # Analyze product series
-            if "WD-" in name:
-                series_analysis["WD-series"] = series_analysis.get("WD-series", 0) + 1
-            elif "INV" in name:
-                series_analysis["INV-series"] = series_analysis.get("INV-series", 0) + 1
-            elif "TOP-PRO" in name:
-                series_analysis["TOP-PRO"] = series_analysis.get("TOP-PRO", 0) + 1
-        
+            for series, token in _SERIES_MARKERS:
+                if token in markers:
+                    series_analysis[series] += 1
+                    break
+            
+            # Technology assessment
+            for feature, token in _TECHNOLOGY_MARKERS:
+                if token in markers:
+                    tech_indicators.append(feature)
+        
+        manufacturers = [
+            manufacturer for bit, (manufacturer, _) in enumerate(_MANUFACTURER_MARKERS)
+            if manufacturer_flags & (1 << bit)
+        ]
         intelligence["manufacturer_diversity"] = len(manufacturers)
-        intelligence["manufacturers_detected"] = list(manufacturers)
-        intelligence["series_breakdown"] = series_analysis
+        intelligence["manufacturers_detected"] = manufacturers
+        intelligence["series_breakdown"] = dict(series_analysis)
         
         # Market concentration analysis
         if len(manufacturers) > 1:
@@ -425,21 +658,39 @@ class SummaryService:
             intelligence["market_type"] = "Single-Manufacturer Focus"
             intelligence["competitive_advantage"] = "Deep series analysis"
         
-        # Technology assessment
-        tech_indicators = []
-        for product in products:
-            name = product.get("name", "")
-            if "INV" in name or "INVERTER" in name:
-                tech_indicators.append("Inverter Technology")
-            if "3PH" in name:
-                tech_indicators.append("3-Phase Power")
-            if "WD-" in name:
-                tech_indicators.append("Window/Wall Mount")
-        
         intelligence["technology_features"] = list(set(tech_indicators))
         
         return intelligence
     
+    def _single_product_landscape(self, products: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Closed-form competitive landscape for runs with at most one product."""
+        intelligence = {
+            "manufacturer_diversity": 0,
+            "manufacturers_detected": [],
+            "series_breakdown": {},
+            "market_type": "Single-Manufacturer Focus",
+            "competitive_advantage": "Deep series analysis",
+            "technology_features": []
+        }
+        if not products:
+            return intelligence
+        
+        markers = set(_MARKER_RE.findall(products[0].get("name", "")))
+        for manufacturer, tokens in _MANUFACTURER_MARKERS:
+            if not markers.isdisjoint(tokens):
+                intelligence["manufacturer_diversity"] = 1
+                intelligence["manufacturers_detected"] = [manufacturer]
+                break
+        for series, token in _SERIES_MARKERS:
+            if token in markers:
+                intelligence["series_breakdown"] = {series: 1}
+                break
+        intelligence["technology_features"] = [
+            feature for feature, token in _TECHNOLOGY_MARKERS if token in markers
+        ]
+        
+        return intelligence
+    
     def _generate_intelligent_achievements(self, total_vendors: int, model_ids: List[str], 
                                          price_range: Dict[str, Any], validation_rate: float,
                                          advanced_metrics: Dict[str, Any], operation_type: str) -> List[str]:
@@ -542,19 +793,15 @@ class SummaryService:
         if not products:
             return 0.0
         
-        completeness_scores = []
-        for product in products:
-            score = 0.0
-            if product.get("name"):
-                score += 0.4
-            if product.get("model_id") and product["model_id"] != "Unknown":
-                score += 0.3
-            cheapest_price = product.get("cheapest_price", 0)
-            if cheapest_price is not None and cheapest_price > 0:
-                score += 0.3
-            completeness_scores.append(score)
-        
-        return sum(completeness_scores) / len(completeness_scores)
+        # Weighted field presence: name 40%, model ID 30%, price 30%
+        total_score = sum(
+            0.4 * bool(product.get("name"))
+            + 0.3 * (product.get("model_id") not in (None, "", "Unknown"))
+            + 0.3 * ((product.get("cheapest_price") or 0) > 0)
+            for product in products
+        )
+        
+        return total_score / len(products)
     
     def _assess_price_consistency(self, price_range: Dict[str, Any]) -> float:
         """Assess price consistency/reliability (0-1)."""
@@ -583,292 +830,242 @@ class SummaryService:
             coverage_efficiency = market_coverage.get("coverage_score", 0)
             price_efficiency = market_coverage.get("price_efficiency", 0)
             
-            # Weighted average
-            weights = [0.3, 0.25, 0.25, 0.2]  # validation, data, coverage, price
-            scores = [validation_efficiency, data_efficiency, coverage_efficiency, price_efficiency]
+            scores = (validation_efficiency, data_efficiency, coverage_efficiency, price_efficiency)
             
-            # Ensure all scores are numbers
-            safe_scores = []
-            for score in scores:
-                if isinstance(score, (int, float)) and not isinstance(score, bool):
-                    safe_scores.append(max(0, min(1, score)))  # Clamp to 0-1 range
-                else:
-                    safe_scores.append(0)
+            # Weighted average; non-numeric and NaN scores count as 0, the rest are clamped to 0-1
+            total = 0.0
+            for weight, score in zip(_EFFICIENCY_WEIGHTS, scores):
+                if isinstance(score, (int, float)) and not isinstance(score, bool) and score == score:
+                    total += weight * (0.0 if score < 0 else 1.0 if score > 1 else score)
             
-            return sum(w * s for w, s in zip(weights, safe_scores))
+            return total
             
         except Exception:
             return 0.5  # Return neutral score if calculation fails
     
     def _generate_actionable_recommendations(self, insights: Dict[str, Any], operation_type: str) -> List[str]:
         """Generate actionable recommendations based on insights."""
-        recommendations = []
-        
-        quality = insights["quality_indicators"]
-        coverage = insights["market_coverage"]
-        competitive = insights["competitive_intelligence"]
-        
-        # Quality-based recommendations
-        if quality.get("validation_success_rate", 0) < 80:
-            recommendations.append("Consider reviewing product name formatting for better validation")
-        
-        # Coverage-based recommendations
-        vendor_density = coverage.get("market_depth", 0)
-        if vendor_density < 5:
-            recommendations.append("Limited vendor options found - consider expanding search criteria")
-        elif vendor_density > 20:
-            recommendations.append("Excellent vendor coverage - high competition benefits buyers")
-        
-        # Price-based recommendations
-        price_efficiency = coverage.get("price_efficiency", 0)
-        if price_efficiency > 0.8:
-            recommendations.append("Good price spread detected - significant savings opportunities available")
-        elif price_efficiency < 0.4:
-            recommendations.append("Limited price variation - market may have price stability")
-        
-        # Competitive intelligence recommendations
-        if competitive.get("manufacturer_diversity", 0) > 1:
-            recommendations.append("Multi-manufacturer comparison available - cross-brand analysis recommended")
-        
-        tech_features = competitive.get("technology_features", [])
-        if "Inverter Technology" in tech_features:
-            recommendations.append("Inverter technology detected - energy efficiency focus recommended")
-        
-        return recommendations
+        return [
+            message
+            for section, metric, default, applies, message in _RECOMMENDATION_RULES
+            if applies(insights[section].get(metric, default))
+        ]
     
     def _format_summary_display(self, file_info: Dict[str, Any], excel_analysis: Dict[str, Any], 
                                operation_insights: Dict[str, Any], operation_type: str) -> str:
         """Format the complete summary for CLI display with dynamic content based on operation type."""
         try:
+            cache_key = None
+            if self.cache_display:
+                cache_key = self._display_cache_key(file_info, excel_analysis, operation_insights, operation_type)
+                cached = self._display_cache.get(cache_key)
+                if cached is not None:
+                    self._display_cache.move_to_end(cache_key)
+                    return cached
+            
+            # Expand the processed-rows token once; every table in the render reuses it
+            file_info["_line_numbers"] = self._extract_line_numbers_list(
+                file_info.get('rows_processed', ''), len(excel_analysis.get("products", []))
+            )
+            
             # Dynamic formatting based on operation type
             if operation_type == "single":
-                return self._format_single_product_summary(file_info, excel_analysis, operation_insights)
+                display = self._format_single_product_summary(file_info, excel_analysis, operation_insights)
             elif operation_type == "batch":
-                return self._format_batch_processing_summary(file_info, excel_analysis, operation_insights)
+                display = self._format_batch_processing_summary(file_info, excel_analysis, operation_insights)
             elif operation_type == "stress":
-                return self._format_stress_test_summary(file_info, excel_analysis, operation_insights)
+                display = self._format_stress_test_summary(file_info, excel_analysis, operation_insights)
             elif operation_type == "range":
-                return self._format_range_processing_summary(file_info, excel_analysis, operation_insights)
+                display = self._format_range_processing_summary(file_info, excel_analysis, operation_insights)
             else:
-                return self._format_generic_summary(file_info, excel_analysis, operation_insights)
+                display = self._format_generic_summary(file_info, excel_analysis, operation_insights)
+            
+            if cache_key is not None:
+                self._display_cache[cache_key] = display
+                if len(self._display_cache) > self.DISPLAY_CACHE_SIZE:
+                    self._display_cache.popitem(last=False)
+            
+            return display
                 
         except Exception as e:
             return f"\n❌ Error formatting summary display: {e}\n"
+        finally:
+            # Render-scoped scratch value; keep it out of the returned file_info
+            file_info.pop("_line_numbers", None)
+    
+    def _display_cache_key(self, file_info: Dict[str, Any], excel_analysis: Dict[str, Any], 
+                           operation_insights: Dict[str, Any], operation_type: str) -> bytes:
+        """Build a stable digest of every input that affects the formatted display."""
+        payload = json.dumps(
+            [file_info, excel_analysis, operation_insights, operation_type],
+            sort_keys=True, default=str, ensure_ascii=False
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
     
     def _generate_comprehensive_summary_tables(self, excel_analysis: Dict[str, Any], 
-                                             file_info: Dict[str, Any]) -> str:
-        """Generate comprehensive summary tables for all operations."""
-        lines = []
+                                             file_info: Dict[str, Any], diversity_matrix: bool = False) -> str:
+        """
+        Generate comprehensive summary tables for all operations.
+        
+        Args:
+            excel_analysis: Excel content analysis with the products list
+            file_info: File information (rows processed, cached line numbers)
+            diversity_matrix: Title the table as the stress-test product diversity matrix
+        """
         products = excel_analysis.get("products", [])
         
         if not products:
             return "\n⚠️  No products found for summary tables"
         
-        lines.append("\n" + "="*80)
+        # Extract line numbers from filename or use index
+        line_numbers = file_info.get("_line_numbers")
+        if line_numbers is None:
+            line_numbers = self._extract_line_numbers_list(file_info.get('rows_processed', ''), len(products))
+        
+        lines = []
+        lines.append("\n" + _BORDER)
         lines.append("📊 COMPREHENSIVE SCRAPING SUMMARY")
-        lines.append("="*80)
+        lines.append(_BORDER)
         
         # Single comprehensive table with all information
-        lines.append("\n📋 PRODUCTS PROCESSED:")
+        lines.append("\n🎯 PRODUCT DIVERSITY MATRIX RESULTS:" if diversity_matrix else "\n📋 PRODUCTS PROCESSED:")
         lines.append("")
-        lines.append("| Line | Product Name                 | Vendors | Model ID | Cheapest Price |")
-        lines.append("|------|------------------------------|---------|----------|----------------|")
-        
-        # Extract line numbers from filename or use index
-        rows_processed = file_info.get('rows_processed', '')
-        line_numbers = self._extract_line_numbers_list(rows_processed, len(products))
-        
-        for i, product in enumerate(products):
-            line_num = line_numbers[i] if i < len(line_numbers) else "N/A"
-            name = product.get("name", "Unknown")[:28]  # Truncate to fit table
-            vendor_count = product.get("vendor_count", 0)
-            model_id = product.get("model_id", "Unknown")
-            cheapest_price = product.get("cheapest_price", 0)
-            
-            # Handle None prices
-            if cheapest_price is None:
-                cheapest_price = 0
-            
-            # Format price nicely
-            if cheapest_price > 0:
-                price_str = f"₪{cheapest_price:,.0f}"
-            else:
-                price_str = "₪0"
-            
-            lines.append(f"| {str(line_num):>4} | {name:<28} | {vendor_count:>7} | {model_id:>8} | {price_str:>14} |")
+        lines.extend(_PRODUCTS_TABLE_HEADER)
+        
+        # Pull each column out once, then format the price column in a single pass
+        count = len(products)
+        lines_col = [*line_numbers[:count], *["N/A"] * (count - len(line_numbers))]
+        names = [product.get("name", "Unknown")[:28] for product in products]
+        vendor_counts = [product.get("vendor_count", 0) for product in products]
+        model_ids = [product.get("model_id", "Unknown") for product in products]
+        price_strs = [_fmt_price(product.get("cheapest_price")) for product in products]
+        
+        row = _PRODUCTS_ROW_TMPL.format
+        lines.extend([
+            row(line=line, name=name, vendors=vendors, model=model, price=price)
+            for line, name, vendors, model, price in zip(lines_col, names, vendor_counts, model_ids, price_strs)
+        ])
         
         lines.append("")
-        lines.append("="*80)
+        lines.append(_BORDER)
         
         return "\n".join(lines)
     
-    def _extract_line_numbers_list(self, rows_processed: str, product_count: int) -> List[str]:
+    def _extract_line_numbers_list(self, rows_processed: str, product_count: int) -> Tuple[str, ...]:
         """Extract line numbers from filename or generate sequence."""
-        line_numbers = []
-        
-        if not rows_processed or rows_processed == "unknown":
-            # Generate sequential numbers starting from 2
-            return [str(i + 2) for i in range(product_count)]
-        
-        # Handle different formats
-        if '-' in str(rows_processed):
-            # Range format like "126-127" or "2-18-125-61"
-            parts = str(rows_processed).split('-')
-            if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
-                # Simple range like "126-127"
-                start, end = int(parts[0]), int(parts[1])
-                return [str(i) for i in range(start, end + 1)]
-            else:
-                # Complex format like "2-18-125-61" - use all parts
-                return [part for part in parts if part.isdigit()]
-        elif str(rows_processed).isdigit():
-            # Single number
-            return [str(rows_processed)]
-        
-        # Fallback
-        return [str(i + 2) for i in range(product_count)]
+        return _line_numbers_for(rows_processed, product_count)
     
     def _format_single_product_summary(self, file_info: Dict[str, Any], excel_analysis: Dict[str, Any], 
                                      operation_insights: Dict[str, Any]) -> str:
         """Format summary for single product processing."""
-        lines = []
-        lines.append("")
-        lines.append("="*80)
-        lines.append("🎯 SINGLE PRODUCT SCRAPING COMPLETE")
-        lines.append("="*80)
-        
-        # File information
-        lines.append(f"\n📄 File: {file_info.get('file_path', 'Unknown')}")
-        
         # Single product focus
         products = excel_analysis.get("products", [])
+        product_section = ""
         if products:
             product = products[0]
-            lines.append(f"🏷️  Product: {product.get('name', 'Unknown')}")
-            lines.append(f"🆔 Model ID: {product.get('model_id', 'Unknown')}")
+            product_section = (f"\n🏷️  Product: {product.get('name', 'Unknown')}"
+                               f"\n🆔 Model ID: {product.get('model_id', 'Unknown')}")
         
         # Vendor performance focus
         total_vendors = excel_analysis.get("total_vendors", 0)
         price_range = excel_analysis.get("price_range", {})
         
-        lines.append(f"\n🏪 VENDOR ANALYSIS:")
-        lines.append(f"  📊 Total Vendors Found: {total_vendors}")
-        
+        price_section = ""
         if price_range.get("min") and price_range.get("max"):
-            lines.append(f"  💰 Price Range: ₪{price_range['min']:,.0f} - ₪{price_range['max']:,.0f}")
-            lines.append(f"  💵 Average Price: ₪{price_range['avg']:,.0f}")
-            
             savings = price_range["max"] - price_range["min"]
             savings_pct = (savings / price_range["max"]) * 100 if price_range["max"] > 0 else 0
-            lines.append(f"  💡 Maximum Savings: ₪{savings:,.0f} ({savings_pct:.1f}%)")
+            price_section = (f"\n  💰 Price Range: ₪{price_range['min']:,.0f} - ₪{price_range['max']:,.0f}"
+                             f"\n  💵 Average Price: ₪{price_range['avg']:,.0f}"
+                             f"\n  💡 Maximum Savings: ₪{savings:,.0f} ({savings_pct:.1f}%)")
         
         # Quality indicators
         validation_rate = excel_analysis.get("validation_success_rate", 0)
-        if validation_rate > 0:
-            lines.append(f"  ✅ Validation Quality: {validation_rate:.1f}%")
-        
-        lines.append(f"\n🎯 Single product analysis complete - {total_vendors} vendor options available!")
-        lines.append("="*80)
-        
-        # Add comprehensive summary tables
-        comprehensive_tables = self._generate_comprehensive_summary_tables(excel_analysis, file_info)
-        lines.append(comprehensive_tables)
-        
-        return "\n".join(lines)
+        quality_section = f"\n  ✅ Validation Quality: {validation_rate:.1f}%" if validation_rate > 0 else ""
+        
+        return (
+            f"\n{_BORDER}\n🎯 SINGLE PRODUCT SCRAPING COMPLETE\n{_BORDER}\n"
+            f"\n📄 File: {file_info.get('file_path', 'Unknown')}{product_section}\n"
+            f"\n🏪 VENDOR ANALYSIS:"
+            f"\n  📊 Total Vendors Found: {total_vendors}{price_section}{quality_section}\n"
+            f"\n🎯 Single product analysis complete - {total_vendors} vendor options available!"
+            f"\n{_BORDER}"
+            f"\n{self._generate_comprehensive_summary_tables(excel_analysis, file_info)}"
+        )
     
     def _format_batch_processing_summary(self, file_info: Dict[str, Any], excel_analysis: Dict[str, Any], 
                                        operation_insights: Dict[str, Any]) -> str:
         """Format summary for batch processing operations."""
-        lines = []
-        lines.append("")
-        lines.append("="*80)
-        lines.append("🎯 BATCH PROCESSING COMPLETE")
-        lines.append("="*80)
-        
-        # File information
-        lines.append(f"\n📄 File: {file_info.get('file_path', 'Unknown')}")
-        lines.append(f"📦 Products Processed: {file_info.get('rows_processed', 'Unknown')}")
-        
         # Batch efficiency metrics
         market_coverage = operation_insights.get("market_coverage", {})
         total_vendors = market_coverage.get("total_vendors", 0)
         unique_models = market_coverage.get("unique_models", 0)
         product_variety = market_coverage.get("product_variety", 0)
         
-        lines.append(f"\n📊 BATCH PERFORMANCE:")
-        lines.append(f"  🏪 Total Vendors Processed: {total_vendors}")
-        lines.append(f"  🎯 Unique Models Found: {unique_models}")
-        lines.append(f"  📦 Products Variety: {product_variety}")
-        
         # Efficiency indicators
+        efficiency_section = ""
         if product_variety > 0:
             avg_vendors_per_product = total_vendors / product_variety
-            lines.append(f"  ⚡ Average Vendors per Product: {avg_vendors_per_product:.1f}")
+            efficiency_section = f"\n  ⚡ Average Vendors per Product: {avg_vendors_per_product:.1f}"
         
         # Price analysis for batch
         price_range = excel_analysis.get("price_range", {})
+        price_section = ""
         if price_range.get("min") and price_range.get("max"):
             price_spread = price_range["max"] - price_range["min"]
-            lines.append(f"  💰 Market Price Spread: ₪{price_spread:,.0f}")
-            lines.append(f"  📈 Price Range Coverage: ₪{price_range['min']:,.0f} - ₪{price_range['max']:,.0f}")
+            price_section = (f"\n  💰 Market Price Spread: ₪{price_spread:,.0f}"
+                             f"\n  📈 Price Range Coverage: ₪{price_range['min']:,.0f} - ₪{price_range['max']:,.0f}")
         
         # Achievements
         achievements = operation_insights.get("achievements", [])
+        achievements_section = ""
         if achievements:
-            lines.append(f"\n🏆 BATCH ACHIEVEMENTS:")
-            for achievement in achievements:
-                lines.append(f"  {achievement}")
-        
-        lines.append(f"\n✅ Batch processing optimization complete!")
-        lines.append("="*80)
-        
-        # Add comprehensive summary tables
-        comprehensive_tables = self._generate_comprehensive_summary_tables(excel_analysis, file_info)
-        lines.append(comprehensive_tables)
-        
-        return "\n".join(lines)
+            achievements_section = "\n\n🏆 BATCH ACHIEVEMENTS:" + "".join(f"\n  {achievement}" for achievement in achievements)
+        
+        return (
+            f"\n{_BORDER}\n🎯 BATCH PROCESSING COMPLETE\n{_BORDER}\n"
+            f"\n📄 File: {file_info.get('file_path', 'Unknown')}"
+            f"\n📦 Products Processed: {file_info.get('rows_processed', 'Unknown')}\n"
+            f"\n📊 BATCH PERFORMANCE:"
+            f"\n  🏪 Total Vendors Processed: {total_vendors}"
+            f"\n  🎯 Unique Models Found: {unique_models}"
+            f"\n  📦 Products Variety: {product_variety}"
+            f"{efficiency_section}{price_section}{achievements_section}\n"
+            f"\n✅ Batch processing optimization complete!"
+            f"\n{_BORDER}"
+            f"\n{self._generate_comprehensive_summary_tables(excel_analysis, file_info)}"
+        )
     
     def _format_stress_test_summary(self, file_info: Dict[str, Any], excel_analysis: Dict[str, Any], 
                                   operation_insights: Dict[str, Any]) -> str:
         """Format summary for stress test operations (like your example)."""
-        lines = []
-        lines.append("")
-        lines.append("="*80)
-        lines.append("🎯 STRESS TEST COMPLETE - MAXIMUM DIVERSITY VALIDATION")
-        lines.append("="*80)
-        
-        # File information
-        lines.append(f"\n📄 File: {file_info.get('file_path', 'Unknown')}")
-        
         # Stress test achievements
         market_coverage = operation_insights.get("market_coverage", {})
         total_vendors = market_coverage.get("total_vendors", 0)
         unique_models = market_coverage.get("unique_models", 0)
         product_variety = market_coverage.get("product_variety", 0)
         
-        lines.append(f"\n🚀 STRESS TEST ACHIEVEMENTS:")
-        lines.append(f"  ✅ {total_vendors} total vendors processed across maximum product diversity")
+        achievements = [f"  ✅ {total_vendors} total vendors processed across maximum product diversity"]
         
         model_ids = excel_analysis.get("model_ids", [])
         if model_ids:
             model_ids_str = ", ".join(model_ids[:4])
             if len(model_ids) > 4:
                 model_ids_str += f", +{len(model_ids)-4} more"
-            lines.append(f"  ✅ {len(model_ids)} unique model IDs detected ({model_ids_str})")
+            achievements.append(f"  ✅ {len(model_ids)} unique model IDs detected ({model_ids_str})")
         
         validation_rate = excel_analysis.get("validation_success_rate", 0)
         if validation_rate > 80:
-            lines.append(f"  ✅ {validation_rate:.0f}% validation success across all diverse product types")
+            achievements.append(f"  ✅ {validation_rate:.0f}% validation success across all diverse product types")
         
         # Calculate efficiency (if we have timing data, we'd use it here)
         if product_variety > 0:
             avg_vendors = total_vendors / product_variety
-            lines.append(f"  ✅ {avg_vendors:.1f} average vendors per product - optimal efficiency")
+            achievements.append(f"  ✅ {avg_vendors:.1f} average vendors per product - optimal efficiency")
         
         # Price range coverage
         price_range = excel_analysis.get("price_range", {})
         if price_range.get("min") and price_range.get("max"):
-            lines.append(f"  ✅ ₪{price_range['min']:,.0f} - ₪{price_range['max']:,.0f} price range - maximum market coverage")
+            achievements.append(f"  ✅ ₪{price_range['min']:,.0f} - ₪{price_range['max']:,.0f} price range - maximum market coverage")
         
         # Detect product diversity patterns
         products = excel_analysis.get("products", [])
@@ -876,24 +1073,21 @@ class SummaryService:
         series_types = set()
         
         for product in products:
-            name = product.get("name", "")
-            if "Electra" in name:
-                manufacturers.add("ELECTRA")
-            elif "Tornado" in name:
-                manufacturers.add("TORNADO")
-            
-            if "WD-" in name:
-                series_types.add("WD-series")
-            elif "INV" in name:
-                series_types.add("INV-series")
-            elif "TOP-PRO" in name:
-                series_types.add("TOP-PRO")
+            markers = set(_MARKER_RE.findall(product.get("name", "")))
+            for token, manufacturer in _STRESS_MANUFACTURER_MARKERS:
+                if token in markers:
+                    manufacturers.add(manufacturer)
+                    break
+            for series, token in _SERIES_MARKERS:
+                if token in markers:
+                    series_types.add(series)
+                    break
         
         if len(manufacturers) > 1:
-            lines.append(f"  ✅ Cross-manufacturer success - {' + '.join(manufacturers)} identical handling")
+            achievements.append(f"  ✅ Cross-manufacturer success - {' + '.join(manufacturers)} identical handling")
         
         if "WD-series" in series_types:
-            lines.append(f"  ✅ Critical WD-series validation - nomenclature intelligence proven")
+            achievements.append(f"  ✅ Critical WD-series validation - nomenclature intelligence proven")
         
         # Advanced analytics for stress test
         advanced_analytics = operation_insights.get("advanced_analytics", {})
@@ -901,165 +1095,121 @@ class SummaryService:
         
         # Efficiency metrics
         if "estimated_efficiency_gain" in advanced_analytics:
-            lines.append(f"  ✅ {advanced_analytics['estimated_efficiency_gain']} efficiency improvement vs sequential processing")
+            achievements.append(f"  ✅ {advanced_analytics['estimated_efficiency_gain']} efficiency improvement vs sequential processing")
         
         # Market intelligence
         market_segment = advanced_analytics.get("market_segment", "")
         if market_segment:
-            lines.append(f"  ✅ {market_segment} market segment analysis - comprehensive coverage")
-        
-        # Product diversity matrix
-        if len(products) > 1:
-            lines.append(f"\n🎯 PRODUCT DIVERSITY MATRIX RESULTS:")
-            lines.append("")
-            lines.append("| Line | Product | Vendors | Model ID | Cheapest Price |")
-            lines.append("|------|---------|---------|----------|----------------|")
-            
-            for product in products[:10]:  # Show max 10 products
-                name = product.get("name", "Unknown")[:30]
-                vendor_count = product.get("vendor_count", "N/A")
-                model_id = product.get("model_id", "Unknown")
-                cheapest = product.get("cheapest_price", 0)
-                if cheapest is None:
-                    cheapest = 0
-                
-                # Extract line number if possible
-                line_num = "N/A"
-                rows_processed = file_info.get('rows_processed', '')
-                if '-' in str(rows_processed):
-                    # For range like "2-18-125-61", just show first number
-                    line_num = str(rows_processed).split('-')[0]
-                elif str(rows_processed).isdigit():
-                    line_num = str(rows_processed)
-                
-                lines.append(f"| {line_num:>4} | {name:<30} | {vendor_count:>7} | {model_id:>8} | ₪{cheapest:>10,.0f} |")
+            achievements.append(f"  ✅ {market_segment} market segment analysis - comprehensive coverage")
+        
         
         # Competitive intelligence insights
+        competitive_section = ""
         if competitive_intel.get("manufacturer_diversity", 0) > 1:
             manufacturers = competitive_intel.get("manufacturers_detected", [])
-            lines.append(f"\n🎯 COMPETITIVE INTELLIGENCE:")
-            lines.append(f"  🏭 Multi-manufacturer analysis: {' + '.join(manufacturers)}")
-            lines.append(f"  📊 Market type: {competitive_intel.get('market_type', 'Unknown')}")
-            
             tech_features = competitive_intel.get("technology_features", [])
+            competitive_section = (
+                f"\n\n🎯 COMPETITIVE INTELLIGENCE:"
+                f"\n  🏭 Multi-manufacturer analysis: {' + '.join(manufacturers)}"
+                f"\n  📊 Market type: {competitive_intel.get('market_type', 'Unknown')}"
+            )
             if tech_features:
-                lines.append(f"  🔧 Technology features: {', '.join(tech_features)}")
+                competitive_section += f"\n  🔧 Technology features: {', '.join(tech_features)}"
         
         # Advanced recommendations
         recommendations = operation_insights.get("recommendations", [])
+        recommendations_section = ""
         if recommendations:
-            lines.append(f"\n💡 STRATEGIC RECOMMENDATIONS:")
-            for rec in recommendations[:3]:  # Show top 3 recommendations
-                lines.append(f"  • {rec}")
-        
-        lines.append(f"\n🏆 Stress test validation complete - system proven at maximum diversity!")
-        lines.append("="*80)
-        
-        # Add comprehensive summary tables
-        comprehensive_tables = self._generate_comprehensive_summary_tables(excel_analysis, file_info)
-        lines.append(comprehensive_tables)
-        
-        return "\n".join(lines)
+            # Show top 3 recommendations
+            recommendations_section = "\n\n💡 STRATEGIC RECOMMENDATIONS:" + "".join(f"\n  • {rec}" for rec in recommendations[:3])
+        
+        return (
+            f"\n{_BORDER}\n🎯 STRESS TEST COMPLETE - MAXIMUM DIVERSITY VALIDATION\n{_BORDER}\n"
+            f"\n📄 File: {file_info.get('file_path', 'Unknown')}\n"
+            f"\n🚀 STRESS TEST ACHIEVEMENTS:\n" + "\n".join(achievements) +
+            f"{competitive_section}{recommendations_section}\n"
+            f"\n🏆 Stress test validation complete - system proven at maximum diversity!"
+            f"\n{_BORDER}"
+            f"\n{self._generate_comprehensive_summary_tables(excel_analysis, file_info, diversity_matrix=len(products) > 1)}"
+        )
     
     def _format_range_processing_summary(self, file_info: Dict[str, Any], excel_analysis: Dict[str, Any], 
                                        operation_insights: Dict[str, Any]) -> str:
         """Format summary for range processing operations."""
-        lines = []
-        lines.append("")
-        lines.append("="*80)
-        lines.append("🎯 RANGE PROCESSING COMPLETE")
-        lines.append("="*80)
-        
-        # File information
-        lines.append(f"\n📄 File: {file_info.get('file_path', 'Unknown')}")
-        lines.append(f"📊 Range Processed: {file_info.get('rows_processed', 'Unknown')}")
-        
         # Range coverage analysis
         market_coverage = operation_insights.get("market_coverage", {})
         total_vendors = market_coverage.get("total_vendors", 0)
         unique_models = market_coverage.get("unique_models", 0)
         product_variety = market_coverage.get("product_variety", 0)
         
-        lines.append(f"\n📈 RANGE COVERAGE ANALYSIS:")
-        lines.append(f"  🏪 Total Vendors Collected: {total_vendors}")
-        lines.append(f"  🎯 Model Diversity: {unique_models} unique models")
-        lines.append(f"  📦 Product Coverage: {product_variety} products")
-        
         # Pattern detection
         price_range = excel_analysis.get("price_range", {})
+        price_section = ""
         if price_range.get("min") and price_range.get("max"):
-            lines.append(f"  💰 Price Pattern: ₪{price_range['min']:,.0f} → ₪{price_range['max']:,.0f}")
-            
             # Calculate market positioning
             mid_price = (price_range["min"] + price_range["max"]) / 2
-            lines.append(f"  📊 Market Position: ₪{mid_price:,.0f} median pricing")
+            price_section = (f"\n  💰 Price Pattern: ₪{price_range['min']:,.0f} → ₪{price_range['max']:,.0f}"
+                             f"\n  📊 Market Position: ₪{mid_price:,.0f} median pricing")
         
         # Achievements  
         achievements = operation_insights.get("achievements", [])
+        achievements_section = ""
         if achievements:
-            lines.append(f"\n🎯 RANGE ACHIEVEMENTS:")
-            for achievement in achievements:
-                lines.append(f"  {achievement}")
+            achievements_section = "\n\n🎯 RANGE ACHIEVEMENTS:" + "".join(f"\n  {achievement}" for achievement in achievements)
         
         # Coverage quality
         validation_rate = excel_analysis.get("validation_success_rate", 0)
-        if validation_rate > 0:
-            lines.append(f"\n✅ Range Quality: {validation_rate:.1f}% validation success")
-        
-        lines.append(f"\n📊 Range processing analysis complete!")
-        lines.append("="*80)
-        
-        # Add comprehensive summary tables
-        comprehensive_tables = self._generate_comprehensive_summary_tables(excel_analysis, file_info)
-        lines.append(comprehensive_tables)
-        
-        return "\n".join(lines)
+        quality_section = f"\n\n✅ Range Quality: {validation_rate:.1f}% validation success" if validation_rate > 0 else ""
+        
+        return (
+            f"\n{_BORDER}\n🎯 RANGE PROCESSING COMPLETE\n{_BORDER}\n"
+            f"\n📄 File: {file_info.get('file_path', 'Unknown')}"
+            f"\n📊 Range Processed: {file_info.get('rows_processed', 'Unknown')}\n"
+            f"\n📈 RANGE COVERAGE ANALYSIS:"
+            f"\n  🏪 Total Vendors Collected: {total_vendors}"
+            f"\n  🎯 Model Diversity: {unique_models} unique models"
+            f"\n  📦 Product Coverage: {product_variety} products"
+            f"{price_section}{achievements_section}{quality_section}\n"
+            f"\n📊 Range processing analysis complete!"
+            f"\n{_BORDER}"
+            f"\n{self._generate_comprehensive_summary_tables(excel_analysis, file_info)}"
+        )
     
     def _format_generic_summary(self, file_info: Dict[str, Any], excel_analysis: Dict[str, Any], 
                               operation_insights: Dict[str, Any]) -> str:
         """Format generic summary for unknown operation types."""
-        lines = []
-        lines.append("")
-        lines.append("="*80)
-        lines.append("🎯 SCRAPING OPERATION COMPLETE - COMPREHENSIVE SUMMARY")
-        lines.append("="*80)
-        
         # File information
-        lines.append(f"\n📄 File: {file_info.get('file_path', 'Unknown')}")
-        lines.append(f"📊 Created: {file_info.get('created_time', 'Unknown').strftime('%Y-%m-%d %H:%M:%S') if isinstance(file_info.get('created_time'), datetime) else 'Unknown'}")
-        lines.append(f"💾 Size: {file_info.get('file_size_kb', 0)} KB")
+        created = file_info.get('created_time_str', 'Unknown')
         
         # Operation achievements
         achievements = operation_insights.get("achievements", [])
+        achievements_section = ""
         if achievements:
-            lines.append(f"\n🏆 OPERATION ACHIEVEMENTS:")
-            for achievement in achievements:
-                lines.append(f"  {achievement}")
+            achievements_section = "\n\n🏆 OPERATION ACHIEVEMENTS:" + "".join(f"\n  {achievement}" for achievement in achievements)
         
         # Market coverage summary
         market_coverage = operation_insights.get("market_coverage", {})
+        coverage_section = ""
         if market_coverage:
-            lines.append(f"\n📈 MARKET COVERAGE SUMMARY:")
-            lines.append(f"  🏪 Total Vendors: {market_coverage.get('total_vendors', 0)}")
-            lines.append(f"  🎯 Unique Models: {market_coverage.get('unique_models', 0)}")
-            lines.append(f"  📦 Product Variety: {market_coverage.get('product_variety', 0)}")
-            lines.append(f"  💰 Price Spread: ₪{market_coverage.get('price_spread', 0):,.0f}")
-        
-        lines.append("")
-        lines.append("✅ Summary generation complete. Excel file ready for analysis!")
-        lines.append("="*80)
-        
-        # Add comprehensive summary tables
-        comprehensive_tables = self._generate_comprehensive_summary_tables(excel_analysis, file_info)
-        lines.append(comprehensive_tables)
-        
-        return "\n".join(lines)
+            coverage_section = (
+                f"\n\n📈 MARKET COVERAGE SUMMARY:"
+                f"\n  🏪 Total Vendors: {market_coverage.get('total_vendors', 0)}"
+                f"\n  🎯 Unique Models: {market_coverage.get('unique_models', 0)}"
+                f"\n  📦 Product Variety: {market_coverage.get('product_variety', 0)}"
+                f"\n  💰 Price Spread: ₪{market_coverage.get('price_spread', 0):,.0f}"
+            )
+        
+        return (
+            f"\n{_BORDER}\n🎯 SCRAPING OPERATION COMPLETE - COMPREHENSIVE SUMMARY\n{_BORDER}\n"
+            f"\n📄 File: {file_info.get('file_path', 'Unknown')}"
+            f"\n📊 Created: {created}"
+            f"\n💾 Size: {file_info.get('file_size_kb', 0)} KB"
+            f"{achievements_section}{coverage_section}\n"
+            f"\n✅ Summary generation complete. Excel file ready for analysis!"
+            f"\n{_BORDER}"
+            f"\n{self._generate_comprehensive_summary_tables(excel_analysis, file_info)}"
+        )
     
     def _extract_rows_from_filename(self, filename: str) -> str:
         """Extract row information from Excel filename."""
-        import re
-        # Pattern: Lines_126_Report_... or Lines_126-127_Report_...
-        match = re.search(r'Lines_([0-9-]+)_Report_', filename)
-        if match:
-            return match.group(1)
-        return "unknown"
\ No newline at end of file
+        return extract_rows_from_filename(filename)
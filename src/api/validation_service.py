@@ -7,11 +7,15 @@ enabling CLI to validate Excel outputs without direct imports.
 
 import sys
 import os
-import subprocess
+import io
+import heapq
+import fnmatch
 from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 import glob
 
+from ._filename_utils import extract_rows_from_filename
+
 
 class ValidationService:
     """Service class for validation operations."""
@@ -33,15 +37,13 @@ class ValidationService:
             Path to latest Excel file or None
         """
         try:
-            search_pattern = str(self.output_dir / pattern)
-            files = glob.glob(search_pattern)
+            files = self._scan_output_files(pattern, limit=1)
             
             if not files:
                 return None
             
-            # Sort by modification time, newest first
-            files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-            return files[0]
+            # Newest first
+            return files[0][0].path
             
         except Exception as e:
             raise Exception(f"Failed to find Excel files: {e}")
@@ -57,29 +59,14 @@ class ValidationService:
             List of matching Excel file paths
         """
         try:
-            files = []
-            
-            for row in row_numbers:
-                # Look for files containing this row number
-                pattern = f"Lines_{row}_Report_*.xlsx"
-                search_pattern = str(self.output_dir / pattern)
-                matching_files = glob.glob(search_pattern)
-                files.extend(matching_files)
-            
-            # Also look for range files
+            # One directory pass: match single-row files and the min-max range file
+            wanted = {str(row) for row in row_numbers}
             if len(row_numbers) > 1:
-                min_row = min(row_numbers)
-                max_row = max(row_numbers)
-                range_pattern = f"Lines_{min_row}-{max_row}_Report_*.xlsx"
-                search_pattern = str(self.output_dir / range_pattern)
-                range_files = glob.glob(search_pattern)
-                files.extend(range_files)
+                wanted.add(f"{min(row_numbers)}-{max(row_numbers)}")
             
-            # Remove duplicates and sort by modification time
-            unique_files = list(set(files))
-            unique_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-            
-            return unique_files
+            files = self._scan_output_files("Lines_*_Report_*.xlsx")
+            return [entry.path for entry, _ in files
+                    if self._extract_rows_from_filename(entry.name) in wanted]
             
         except Exception as e:
             raise Exception(f"Failed to find Excel files for rows: {e}")
@@ -100,26 +87,40 @@ class ValidationService:
             if not os.path.exists(excel_file):
                 return False, {"error": f"Excel file not found: {excel_file}"}
             
-            # Build validation command
-            cmd = [sys.executable, str(self.validator_path), excel_file]
-            
-            if threshold != 8.0:
-                cmd.extend(["--threshold", str(threshold)])
+            # Run the validator in-process, collecting the report it would print on the command line.
+            # Unlike the old subprocess call this runs in the caller's working directory rather than
+            # project_root, so relative excel_file paths resolve against the caller's cwd.
+            ExcelValidator = self._load_validator()
+            output = io.StringIO()
+            validator = ExcelValidator(threshold=threshold, output=output)
+            completed = validator.validate_excel_file(excel_file)
+            if completed:
+                print(validator.generate_report(), file=output)
             
-            # Run validation
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd=str(self.project_root))
-            
-            if result.returncode == 0:
-                # Parse validation output
-                validation_results = self._parse_validation_output(result.stdout)
+            # Same outcome as the command-line exit code: products needing review count as a failure
+            stats = validator.summary_stats
+            if completed and stats['review'] == 0:
+                validation_results = self._parse_validation_output(output.getvalue())
+                validation_results.update({
+                    "total_vendors": stats['total'],
+                    "validated_vendors": stats['valid'],
+                    "validation_percentage": (stats['valid'] / stats['total'] * 100) if stats['total'] else 0.0
+                })
                 return True, validation_results
             else:
-                error_msg = result.stderr or result.stdout
-                return False, {"error": f"Validation failed: {error_msg}"}
+                return False, {"error": f"Validation failed: {output.getvalue()}"}
                 
         except Exception as e:
             return False, {"error": f"Validation service error: {e}"}
     
+    def _load_validator(self):
+        """Import ExcelValidator from excel_validator.py on first use."""
+        project_root = str(self.project_root)
+        if project_root not in sys.path:
+            sys.path.append(project_root)
+        from excel_validator import ExcelValidator
+        return ExcelValidator
+    
     def _parse_validation_output(self, output: str) -> Dict[str, Any]:
         """Parse validation output into structured data."""
         results = {
@@ -180,22 +181,18 @@ class ValidationService:
             List of validation history records
         """
         try:
-            # Find all Excel files in output directory
-            pattern = str(self.output_dir / "Lines_*_Report_*.xlsx")
-            files = glob.glob(pattern)
-            
-            # Sort by modification time, newest first
-            files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
+            # Find all Excel files in output directory, newest first
+            files = self._scan_output_files("Lines_*_Report_*.xlsx", limit=limit)
             
             history = []
-            for file_path in files[:limit]:
+            for entry, stat in files:
                 file_info = {
-                    "file_path": file_path,
-                    "filename": os.path.basename(file_path),
-                    "created_time": os.path.getctime(file_path),
-                    "modified_time": os.path.getmtime(file_path),
-                    "file_size": os.path.getsize(file_path),
-                    "rows_processed": self._extract_rows_from_filename(os.path.basename(file_path))
+                    "file_path": entry.path,
+                    "filename": entry.name,
+                    "created_time": stat.st_ctime,
+                    "modified_time": stat.st_mtime,
+                    "file_size": stat.st_size,
+                    "rows_processed": self._extract_rows_from_filename(entry.name)
                 }
                 history.append(file_info)
             
@@ -204,14 +201,34 @@ class ValidationService:
         except Exception as e:
             raise Exception(f"Failed to get validation history: {e}")
     
+    def _scan_output_files(self, pattern: str, limit: Optional[int] = None) -> List[Tuple[os.DirEntry, os.stat_result]]:
+        """
+        List output files matching a filename pattern with one stat per file.
+        
+        Args:
+            pattern: Glob-style filename pattern
+            limit: Only return the newest `limit` files (selected without a full sort)
+            
+        Returns:
+            (entry, stat) pairs sorted by modification time, newest first
+        """
+        try:
+            # fnmatch (not fnmatchcase) so matching is case-insensitive on Windows, like glob
+            with os.scandir(self.output_dir) as it:
+                files = [(entry, entry.stat()) for entry in it
+                         if fnmatch.fnmatch(entry.name, pattern)]
+        except FileNotFoundError:
+            return []
+        
+        if limit is not None:
+            return heapq.nlargest(limit, files, key=lambda item: item[1].st_mtime)
+        
+        files.sort(key=lambda item: item[1].st_mtime, reverse=True)
+        return files
+    
     def _extract_rows_from_filename(self, filename: str) -> str:
         """Extract row information from Excel filename."""
-        import re
-        # Pattern: Lines_126_Report_... or Lines_126-127_Report_...
-        match = re.search(r'Lines_([0-9-]+)_Report_', filename)
-        if match:
-            return match.group(1)
-        return "unknown"
+        return extract_rows_from_filename(filename)
     
     def check_validation_requirements(self) -> Dict[str, Any]:
         """
@@ -4,9 +4,14 @@ Main authentication manager for Universal Product Scraper.
 Provides high-level authentication operations, user management, and system initialization.
 """
 
+import asyncio
 import getpass
+import json
 import sys
+import time
+import threading
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Optional, List, Dict, Any, Tuple
 
 from .database import AuthDatabase
@@ -17,6 +22,20 @@ from .session_manager import SessionManager
 class AuthManager:
     """Main authentication manager handling all auth operations."""
     
+    # Seconds a fetched user record is reused before going back to the database
+    USER_CACHE_TTL = 5.0
+    
+    # Target duration of one Argon2 hash when calibrating on first boot
+    ARGON2_TARGET_MS = 500
+    
+    # Calibrated Argon2 parameters, stored next to the user database
+    ARGON2_PARAMS_FILE = "argon2_params.json"
+    
+    # Databases already known to have users in this process. The admin account
+    # cannot be deleted, so once a database has users it keeps them.
+    _provisioned_db_paths = set()
+    _provisioned_lock = threading.Lock()
+    
     def __init__(self, db_path: Optional[str] = None):
         """Initialize authentication manager."""
         self.db = AuthDatabase(db_path)
@@ -24,12 +43,46 @@ class AuthManager:
         self.password_validator = PasswordValidator()
         self.password_hasher = PasswordHasher()
         
+        # username -> (monotonic fetch time, user record); dropped whenever the user row changes
+        self._user_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._user_cache_lock = threading.Lock()
+        
+        self._load_argon2_params()
+        
         # Initialize default admin user if no users exist
         self._initialize_default_admin()
     
+    def _load_argon2_params(self):
+        """Apply the stored Argon2 parameters, calibrating and saving them on first boot."""
+        if not self.password_hasher.argon2_available():
+            return
+        
+        params_path = Path(self.db.db_path).parent / self.ARGON2_PARAMS_FILE
+        try:
+            params = json.loads(params_path.read_text(encoding='utf-8'))
+            self.password_hasher.configure_argon2(
+                params['time_cost'], params['memory_cost'], params['parallelism']
+            )
+            return
+        except (OSError, ValueError, TypeError, KeyError):
+            pass  # Missing or unreadable: calibrate below
+        
+        print("⏳ Calibrating password hashing for this machine (first start only)...")
+        params = self.password_hasher.calibrate_argon2(self.ARGON2_TARGET_MS)
+        self.password_hasher.configure_argon2(**params)
+        try:
+            params_path.write_text(json.dumps(params, indent=2), encoding='utf-8')
+        except OSError:
+            pass  # Calibrate again next start
+    
     def _initialize_default_admin(self):
         """Create default admin user if no users exist."""
-        if self.db.get_user_count() == 0:
+        db_path = self.db.db_path
+        with self._provisioned_lock:
+            if db_path in self._provisioned_db_paths:
+                return
+        
+        if not self.db.has_users():
             # Create default admin with temporary password
             default_password = "Admin@123"
             password_hash = self.password_hasher.hash_password(default_password)
@@ -46,6 +99,28 @@ class AuthManager:
                 print("   Password: Admin@123")
                 print("   ⚠️  You MUST change this password on first login!")
                 print()
+        
+        with self._provisioned_lock:
+            self._provisioned_db_paths.add(db_path)
+    
+    def _get_user_cached(self, username: str) -> Optional[Dict[str, Any]]:
+        """Get a user record, reusing a recent fetch within USER_CACHE_TTL."""
+        now = time.monotonic()
+        with self._user_cache_lock:
+            cached = self._user_cache.get(username)
+            if cached is not None and now - cached[0] < self.USER_CACHE_TTL:
+                return cached[1]
+        
+        user = self.db.get_user(username)
+        if user:
+            with self._user_cache_lock:
+                self._user_cache[username] = (now, user)
+        return user
+    
+    def _invalidate_user(self, username: str):
+        """Drop a cached user record after its row has been modified."""
+        with self._user_cache_lock:
+            self._user_cache.pop(username, None)
     
     def authenticate_user(self, username: str, password: str) -> Tuple[bool, str, bool]:
         """
@@ -58,20 +133,19 @@ class AuthManager:
         Returns:
             Tuple of (success, message, must_change_password)
         """
-        user = self.db.get_user(username)
+        user = self._get_user_cached(username)
         if not user:
             return False, "Invalid username or password", False
         
         # Check if account is locked
-        if user['locked_until']:
-            locked_until = datetime.fromisoformat(user['locked_until'])
-            if datetime.now() < locked_until:
-                minutes_left = int((locked_until - datetime.now()).total_seconds() / 60)
-                return False, f"Account locked. Try again in {minutes_left} minutes", False
+        if user['is_locked']:
+            minutes_left = int(user['lock_seconds_left'] / 60)
+            return False, f"Account locked. Try again in {minutes_left} minutes", False
         
         # Check password
         if not self.password_hasher.verify_password(password, user['password_hash']):
             failed_attempts = self.db.increment_failed_attempts(username)
+            self._invalidate_user(username)
             
             if failed_attempts >= 5:
                 self.db.lock_user(username, 15)  # Lock for 15 minutes
@@ -81,19 +155,35 @@ class AuthManager:
                 return False, f"Invalid password. {remaining} attempts remaining", False
         
         # Check password expiry
-        password_expires = datetime.fromisoformat(user['password_expires_at'])
-        if datetime.now() > password_expires:
+        if user['is_password_expired']:
             return False, "Password has expired. Please contact administrator", True
         
-        # Authentication successful
-        self.db.reset_failed_attempts(username)
-        self.db.update_last_login(username)
+        # Upgrade legacy bcrypt (or outdated Argon2) hashes now that we have the plain password
+        if self.password_hasher.needs_rehash(user['password_hash']):
+            self.db.update_password_hash(username, self.password_hasher.hash_password(password))
         
-        # Create session
-        session_token = self.session_manager.create_session(username)
+        # Authentication successful: reset attempts, stamp last login and create the session together
+        session_token = self.session_manager.create_login_session(username)
+        self._invalidate_user(username)
         
         return True, "Authentication successful", user['must_change_password']
     
+    async def authenticate_user_async(self, username: str, password: str) -> Tuple[bool, str, bool]:
+        """
+        Authenticate a user without blocking the event loop.
+        
+        Runs authenticate_user in a worker thread; the password hash itself runs
+        on PasswordHasher's pool, so concurrent logins overlap.
+        
+        Args:
+            username: Username to authenticate
+            password: Password to verify
+            
+        Returns:
+            Tuple of (success, message, must_change_password)
+        """
+        return await asyncio.to_thread(self.authenticate_user, username, password)
+    
     def login_flow(self) -> bool:
         """
         Handle complete login flow with user interaction.
@@ -202,7 +292,9 @@ class AuthManager:
                 
                 # Update password
                 password_hash = self.password_hasher.hash_password(new_password)
-                if self.db.update_password(username, password_hash):
+                updated = self.db.update_password(username, password_hash)
+                self._invalidate_user(username)
+                if updated:
                     return True
                 else:
                     print("❌ Failed to update password")
@@ -266,6 +358,7 @@ class AuthManager:
             return False, "User does not exist"
         
         success = self.db.delete_user(username)
+        self._invalidate_user(username)
         if success:
             return True, f"User '{username}' deleted successfully"
         else:
@@ -284,6 +377,7 @@ class AuthManager:
         # Update password
         password_hash = self.password_hasher.hash_password(new_password)
         success = self.db.update_password(username, password_hash)
+        self._invalidate_user(username)
         
         if success:
             return True, f"Password changed for user '{username}'"
@@ -293,20 +387,21 @@ class AuthManager:
     def list_users(self) -> List[Dict[str, Any]]:
         """List all users (admin function)."""
         users = self.db.list_users()
+        now = datetime.now()
         
         # Add additional info
         for user in users:
-            # Convert datetime strings to more readable format
-            if user['created_at']:
-                created = datetime.fromisoformat(user['created_at'])
-                user['created_at_readable'] = created.strftime("%Y-%m-%d %H:%M")
+            # Format the TIMESTAMP columns (returned as datetime objects) for display
+            created = user['created_at']
+            if created:
+                user['created_at_readable'] = f"{created:%Y-%m-%d %H:%M}"
             
-            if user['password_expires_at']:
-                expires = datetime.fromisoformat(user['password_expires_at'])
-                user['password_expires_readable'] = expires.strftime("%Y-%m-%d")
+            expires = user['password_expires_at']
+            if expires:
+                user['password_expires_readable'] = f"{expires:%Y-%m-%d}"
                 
                 # Check if password is expired or expiring soon
-                days_until_expiry = (expires - datetime.now()).days
+                days_until_expiry = (expires - now).days
                 if days_until_expiry < 0:
                     user['password_status'] = "EXPIRED"
                 elif days_until_expiry < 30:
@@ -314,9 +409,9 @@ class AuthManager:
                 else:
                     user['password_status'] = "OK"
             
-            if user['last_login']:
-                last_login = datetime.fromisoformat(user['last_login'])
-                user['last_login_readable'] = last_login.strftime("%Y-%m-%d %H:%M")
+            last_login = user['last_login']
+            if last_login:
+                user['last_login_readable'] = f"{last_login:%Y-%m-%d %H:%M}"
             else:
                 user['last_login_readable'] = "Never"
         
@@ -6,11 +6,160 @@ Handles SQLite database creation, user management, and data persistence.
 
 import sqlite3
 import os
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from pathlib import Path
 
 
+# Compiled statements kept per connection (the module default is 128)
+_STATEMENT_CACHE_SIZE = 256
+
+# UPDATE ... RETURNING needs SQLite 3.35+
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Applied once per connection. WAL lets readers proceed alongside a writer and, with
+# synchronous=NORMAL, commits no longer fsync the main database file every time.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",
+    "PRAGMA mmap_size=67108864",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+# users columns returned as datetime objects by get_user/list_users. Converted here
+# rather than with sqlite3.register_converter, which would affect every
+# PARSE_DECLTYPES connection in the process.
+_USER_TIMESTAMP_COLUMNS = ("created_at", "password_expires_at", "last_login", "locked_until")
+
+
+def _user_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    """Turn a users row into a dict, parsing its TIMESTAMP columns (stored ISO text)."""
+    user = dict(row)
+    for column in _USER_TIMESTAMP_COLUMNS:
+        value = user.get(column)
+        if isinstance(value, str):
+            user[column] = datetime.fromisoformat(value)
+    return user
+
+
+# SQL statements, kept as module constants so the connection's statement cache reuses
+# the compiled form on every call
+_SQL_CREATE_USERS_TABLE = """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        password_expires_at TIMESTAMP NOT NULL,
+        must_change_password BOOLEAN DEFAULT 0,
+        last_login TIMESTAMP,
+        failed_attempts INTEGER DEFAULT 0,
+        locked_until TIMESTAMP
+    )
+"""
+_SQL_CREATE_SESSIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT NOT NULL,
+        session_token TEXT UNIQUE NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        expires_at TIMESTAMP NOT NULL,
+        FOREIGN KEY (username) REFERENCES users (username)
+    )
+"""
+_SQL_CREATE_META_TABLE = """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+"""
+_SQL_CREATE_SESSIONS_USERNAME_INDEX = "CREATE INDEX IF NOT EXISTS idx_sessions_username ON sessions (username)"
+_SQL_CREATE_SESSIONS_EXPIRES_INDEX = "CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)"
+_SQL_INSERT_USER = """
+    INSERT INTO users (username, password_hash, password_expires_at, must_change_password)
+    VALUES (?, ?, ?, ?)
+"""
+# Lock and expiry state is computed by SQLite. Python-written timestamps are stored
+# in local time, so they are compared against local 'now'.
+_SQL_GET_USER = """
+    SELECT *,
+           julianday(locked_until) > julianday('now', 'localtime') AS is_locked,
+           (julianday(locked_until) - julianday('now', 'localtime')) * 86400.0 AS lock_seconds_left,
+           julianday(password_expires_at) < julianday('now', 'localtime') AS is_password_expired
+    FROM users
+    WHERE username = ?
+"""
+_SQL_UPDATE_PASSWORD = """
+    UPDATE users
+    SET password_hash = ?, password_expires_at = ?, must_change_password = 0
+    WHERE username = ?
+"""
+_SQL_UPDATE_PASSWORD_HASH = "UPDATE users SET password_hash = ? WHERE username = ?"
+_SQL_UPDATE_LAST_LOGIN = "UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE username = ?"
+_SQL_INCREMENT_FAILED_RETURNING = """
+    UPDATE users
+    SET failed_attempts = failed_attempts + 1
+    WHERE username = ?
+    RETURNING failed_attempts
+"""
+_SQL_INCREMENT_FAILED = """
+    UPDATE users
+    SET failed_attempts = failed_attempts + 1
+    WHERE username = ?
+"""
+_SQL_GET_FAILED_ATTEMPTS = "SELECT failed_attempts FROM users WHERE username = ?"
+_SQL_RESET_FAILED = """
+    UPDATE users
+    SET failed_attempts = 0, locked_until = NULL
+    WHERE username = ?
+"""
+_SQL_LOCK_USER = "UPDATE users SET locked_until = ? WHERE username = ?"
+_SQL_DELETE_USER_SESSIONS = "DELETE FROM sessions WHERE username = ?"
+_SQL_DELETE_USER = "DELETE FROM users WHERE username = ?"
+_SQL_LIST_USERS = """
+    SELECT username, created_at, password_expires_at, last_login,
+           must_change_password, failed_attempts, locked_until
+    FROM users
+    ORDER BY username
+"""
+_SQL_INSERT_SESSION = """
+    INSERT INTO sessions (username, session_token, expires_at)
+    VALUES (?, ?, ?)
+"""
+_SQL_FINALIZE_LOGIN = """
+    UPDATE users
+    SET failed_attempts = 0, locked_until = NULL, last_login = CURRENT_TIMESTAMP
+    WHERE username = ?
+"""
+# Session expires_at is written in local time, so the cutoff is bound as a parameter
+# rather than compared against CURRENT_TIMESTAMP (UTC)
+_SQL_VALIDATE_SESSION = """
+    SELECT s.username,
+           (julianday(s.expires_at) - julianday('now', 'localtime')) * 86400.0 AS seconds_left
+    FROM sessions s
+    JOIN users u ON u.username = s.username
+    WHERE s.session_token = ? AND s.expires_at > ?
+"""
+_SQL_DELETE_SESSION = "DELETE FROM sessions WHERE session_token = ?"
+_SQL_EXTEND_SESSION = """
+    UPDATE sessions
+    SET session_token = ?, expires_at = ?
+    WHERE session_token = ?
+"""
+_SQL_DELETE_EXPIRED_SESSIONS = "DELETE FROM sessions WHERE expires_at <= ?"
+_SQL_GET_META = "SELECT value FROM meta WHERE key = ?"
+_SQL_SET_META = "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)"
+_SQL_USER_EXISTS = "SELECT 1 FROM users WHERE username = ?"
+_SQL_COUNT_USERS = "SELECT COUNT(*) FROM users"
+_SQL_HAS_USERS = "SELECT 1 FROM users LIMIT 1"
+
+
 class AuthDatabase:
     """Manages SQLite database operations for user authentication."""
     
@@ -24,37 +173,46 @@ class AuthDatabase:
             db_path = db_dir / "users.db"
         
         self.db_path = str(db_path)
+        
+        # One long-lived connection shared by every call; the lock serializes access to it
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                     cached_statements=_STATEMENT_CACHE_SIZE)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        
+        self._configure_connection()
         self._initialize_database()
     
+    @contextmanager
+    def _connection(self):
+        """Yield the shared connection as a transaction: commit on success, roll back on error."""
+        with self._lock, self._conn:
+            yield self._conn
+    
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+    
+    def _configure_connection(self):
+        """Apply connection PRAGMAs (WAL journal, relaxed sync, in-memory temp storage)."""
+        with self._lock:
+            for pragma in _CONNECTION_PRAGMAS:
+                self._conn.execute(pragma)
+    
     def _initialize_database(self):
         """Create tables if they don't exist."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT UNIQUE NOT NULL,
-                    password_hash TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    password_expires_at TIMESTAMP NOT NULL,
-                    must_change_password BOOLEAN DEFAULT 0,
-                    last_login TIMESTAMP,
-                    failed_attempts INTEGER DEFAULT 0,
-                    locked_until TIMESTAMP
-                )
-            """)
+        with self._connection() as conn:
+            conn.execute(_SQL_CREATE_USERS_TABLE)
+            
+            conn.execute(_SQL_CREATE_SESSIONS_TABLE)
             
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS sessions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT NOT NULL,
-                    session_token TEXT UNIQUE NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    expires_at TIMESTAMP NOT NULL,
-                    FOREIGN KEY (username) REFERENCES users (username)
-                )
-            """)
+            # Small key/value store for housekeeping state (e.g. last session cleanup)
+            conn.execute(_SQL_CREATE_META_TABLE)
             
-            conn.commit()
+            # Session lookups by owner (user deletion) and by expiry (cleanup)
+            conn.execute(_SQL_CREATE_SESSIONS_USERNAME_INDEX)
+            conn.execute(_SQL_CREATE_SESSIONS_EXPIRES_INDEX)
     
     def create_user(self, username: str, password_hash: str, 
                    must_change_password: bool = False) -> bool:
@@ -63,113 +221,89 @@ class AuthDatabase:
             # Password expires in 6 months
             password_expires = datetime.now() + timedelta(days=180)
             
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT INTO users (username, password_hash, password_expires_at, must_change_password)
-                    VALUES (?, ?, ?, ?)
-                """, (username, password_hash, password_expires, must_change_password))
-                conn.commit()
+            with self._connection() as conn:
+                conn.execute(_SQL_INSERT_USER, (username, password_hash, password_expires, must_change_password))
             return True
         except sqlite3.IntegrityError:
             return False  # User already exists
     
     def get_user(self, username: str) -> Optional[Dict[str, Any]]:
-        """Get user information."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT * FROM users WHERE username = ?
-            """, (username,))
+        """Get user information, including computed is_locked / lock_seconds_left / is_password_expired."""
+        with self._connection() as conn:
+            cursor = conn.execute(_SQL_GET_USER, (username,))
             row = cursor.fetchone()
-            return dict(row) if row else None
+            return _user_from_row(row) if row else None
     
     def update_password(self, username: str, new_password_hash: str) -> bool:
         """Update user password."""
         try:
             password_expires = datetime.now() + timedelta(days=180)
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("""
-                    UPDATE users 
-                    SET password_hash = ?, password_expires_at = ?, must_change_password = 0
-                    WHERE username = ?
-                """, (new_password_hash, password_expires, username))
-                conn.commit()
+            with self._connection() as conn:
+                cursor = conn.execute(_SQL_UPDATE_PASSWORD, (new_password_hash, password_expires, username))
+                return cursor.rowcount > 0
+        except sqlite3.Error:
+            return False
+    
+    def update_password_hash(self, username: str, password_hash: str) -> bool:
+        """Replace the stored hash only (rehash on login); expiry and flags are untouched."""
+        try:
+            with self._connection() as conn:
+                cursor = conn.execute(_SQL_UPDATE_PASSWORD_HASH, (password_hash, username))
                 return cursor.rowcount > 0
         except sqlite3.Error:
             return False
     
     def update_last_login(self, username: str):
         """Update last login timestamp."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE username = ?
-            """, (username,))
-            conn.commit()
+        with self._connection() as conn:
+            conn.execute(_SQL_UPDATE_LAST_LOGIN, (username,))
     
     def increment_failed_attempts(self, username: str) -> int:
         """Increment failed login attempts."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                UPDATE users 
-                SET failed_attempts = failed_attempts + 1
-                WHERE username = ?
-            """, (username,))
-            
-            cursor = conn.execute("""
-                SELECT failed_attempts FROM users WHERE username = ?
-            """, (username,))
-            result = cursor.fetchone()
-            conn.commit()
+        with self._connection() as conn:
+            if _HAS_RETURNING:
+                cursor = conn.execute(_SQL_INCREMENT_FAILED_RETURNING, (username,))
+                result = cursor.fetchone()
+                # Drain the statement so it is finalized before the commit
+                cursor.fetchall()
+            else:
+                conn.execute(_SQL_INCREMENT_FAILED, (username,))
+                
+                cursor = conn.execute(_SQL_GET_FAILED_ATTEMPTS, (username,))
+                result = cursor.fetchone()
             
             return result[0] if result else 0
     
     def reset_failed_attempts(self, username: str):
         """Reset failed login attempts."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                UPDATE users 
-                SET failed_attempts = 0, locked_until = NULL
-                WHERE username = ?
-            """, (username,))
-            conn.commit()
+        with self._connection() as conn:
+            conn.execute(_SQL_RESET_FAILED, (username,))
     
     def lock_user(self, username: str, lock_duration_minutes: int = 15):
         """Lock user account for specified duration."""
         locked_until = datetime.now() + timedelta(minutes=lock_duration_minutes)
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                UPDATE users 
-                SET locked_until = ?
-                WHERE username = ?
-            """, (locked_until, username))
-            conn.commit()
+        with self._connection() as conn:
+            conn.execute(_SQL_LOCK_USER, (locked_until, username))
     
     def delete_user(self, username: str) -> bool:
         """Delete a user."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 # Delete sessions first
-                conn.execute("DELETE FROM sessions WHERE username = ?", (username,))
+                conn.execute(_SQL_DELETE_USER_SESSIONS, (username,))
                 # Delete user
-                cursor = conn.execute("DELETE FROM users WHERE username = ?", (username,))
-                conn.commit()
+                cursor = conn.execute(_SQL_DELETE_USER, (username,))
                 return cursor.rowcount > 0
         except sqlite3.Error:
             return False
     
     def list_users(self) -> List[Dict[str, Any]]:
         """List all users with their info."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT username, created_at, password_expires_at, last_login, 
-                       must_change_password, failed_attempts, locked_until
-                FROM users 
-                ORDER BY username
-            """)
-            return [dict(row) for row in cursor.fetchall()]
+        with self._connection() as conn:
+            cursor = conn.execute(_SQL_LIST_USERS)
+            return [_user_from_row(row) for row in cursor.fetchall()]
     
     def create_session(self, username: str, session_token: str, 
                       duration_hours: int = 8) -> bool:
@@ -177,46 +311,88 @@ class AuthDatabase:
         try:
             expires_at = datetime.now() + timedelta(hours=duration_hours)
             
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT INTO sessions (username, session_token, expires_at)
-                    VALUES (?, ?, ?)
-                """, (username, session_token, expires_at))
-                conn.commit()
+            with self._connection() as conn:
+                conn.execute(_SQL_INSERT_SESSION, (username, session_token, expires_at))
+            return True
+        except sqlite3.Error:
+            return False
+    
+    def finalize_successful_login(self, username: str, session_token: str,
+                                  duration_hours: int = 8) -> bool:
+        """Reset failed attempts, stamp last login and create the session in one transaction."""
+        try:
+            expires_at = datetime.now() + timedelta(hours=duration_hours)
+            
+            with self._connection() as conn:
+                conn.execute(_SQL_FINALIZE_LOGIN, (username,))
+                conn.execute(_SQL_INSERT_SESSION, (username, session_token, expires_at))
             return True
         except sqlite3.Error:
             return False
     
     def validate_session(self, session_token: str) -> Optional[str]:
         """Validate session and return username if valid."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT username FROM sessions 
-                WHERE session_token = ? AND expires_at > CURRENT_TIMESTAMP
-            """, (session_token,))
+        session = self.get_valid_session(session_token)
+        return session[0] if session else None
+    
+    def get_valid_session(self, session_token: str) -> Optional[Tuple[str, float]]:
+        """Return (username, seconds until expiry) for a live session, or None."""
+        with self._connection() as conn:
+            cursor = conn.execute(_SQL_VALIDATE_SESSION, (session_token, datetime.now()))
             result = cursor.fetchone()
-            return result[0] if result else None
+            return (result[0], result[1]) if result else None
     
     def delete_session(self, session_token: str):
         """Delete a session."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM sessions WHERE session_token = ?", (session_token,))
-            conn.commit()
+        with self._connection() as conn:
+            conn.execute(_SQL_DELETE_SESSION, (session_token,))
+    
+    def extend_session(self, session_token: str, new_session_token: str,
+                       new_expires_at: datetime) -> bool:
+        """Move a session to a new token and expiry in a single UPDATE."""
+        try:
+            with self._connection() as conn:
+                cursor = conn.execute(_SQL_EXTEND_SESSION, (new_session_token, new_expires_at, session_token))
+                return cursor.rowcount > 0
+        except sqlite3.Error:
+            return False
     
     def cleanup_expired_sessions(self):
-        """Remove expired sessions."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM sessions WHERE expires_at <= CURRENT_TIMESTAMP")
-            conn.commit()
+        """Remove expired sessions in a single DELETE."""
+        with self._connection() as conn:
+            conn.execute(_SQL_DELETE_EXPIRED_SESSIONS, (datetime.now(),))
+    
+    def cleanup_expired_sessions_if_due(self, min_interval_seconds: float) -> bool:
+        """
+        Remove expired sessions unless a cleanup ran within min_interval_seconds.
+        
+        Returns:
+            True if the cleanup ran
+        """
+        now = time.time()
+        with self._connection() as conn:
+            row = conn.execute(_SQL_GET_META, ('last_session_cleanup',)).fetchone()
+            if row is not None and now - float(row[0]) < min_interval_seconds:
+                return False
+            
+            conn.execute(_SQL_DELETE_EXPIRED_SESSIONS, (datetime.now(),))
+            conn.execute(_SQL_SET_META, ('last_session_cleanup', str(now)))
+            return True
     
     def user_exists(self, username: str) -> bool:
         """Check if user exists."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT 1 FROM users WHERE username = ?", (username,))
+        with self._connection() as conn:
+            cursor = conn.execute(_SQL_USER_EXISTS, (username,))
             return cursor.fetchone() is not None
     
     def get_user_count(self) -> int:
         """Get total number of users."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT COUNT(*) FROM users")
-            return cursor.fetchone()[0]
\ No newline at end of file
+        with self._connection() as conn:
+            cursor = conn.execute(_SQL_COUNT_USERS)
+            return cursor.fetchone()[0]
+    
+    def has_users(self) -> bool:
+        """Check whether any user exists (stops at the first row instead of counting)."""
+        with self._connection() as conn:
+            cursor = conn.execute(_SQL_HAS_USERS)
+            return cursor.fetchone() is not None
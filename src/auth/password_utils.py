@@ -4,10 +4,57 @@ Password utilities for authentication system.
 Provides password validation, hashing, and security features.
 """
 
+import math
+import os
 import re
+import time
 import bcrypt
-import secrets
-from typing import Tuple, List
+from typing import Dict, Optional, Tuple, List
+
+try:
+    # Optional Argon2id hashing; bcrypt is used when argon2-cffi is not installed
+    from argon2 import PasswordHasher as _Argon2Hasher, Type as _Argon2Type
+    from argon2.exceptions import VerificationError, InvalidHashError
+except ImportError:
+    _Argon2Hasher = None
+
+
+# More than 3 consecutive identical characters
+_REPEAT_RE = re.compile(r'(.)\1{3,}')
+
+# Common sequences penalized by the strength meter (matched against the lowercased password)
+_WEAK_PATTERN_RE = re.compile(r'123|abc|qwe|password')
+
+# Rejected outright by the validator (compared lowercased)
+_COMMON_PASSWORDS = frozenset({'password', '12345678', 'admin123', 'qwerty123'})
+
+
+def _urandom_indices(bounds: List[int]) -> List[int]:
+    """
+    Draw one uniform index in [0, bound) for each bound.
+    
+    Bytes come from bulk os.urandom reads, as many per draw as the bound needs
+    (one byte up to 256, two up to 65536, ...). A draw is rejected when it falls
+    in the incomplete top range for its bound, which keeps the mapping unbiased.
+    """
+    indices = []
+    pool = os.urandom(len(bounds) * 2)
+    pos = 0
+    for bound in bounds:
+        width = max(1, ((bound - 1).bit_length() + 7) // 8)
+        span = 1 << (8 * width)
+        assert 0 < bound <= span
+        limit = span - (span % bound)
+        while True:
+            if pos + width > len(pool):
+                pool = pool[pos:] + os.urandom(len(bounds) * width)
+                pos = 0
+            value = int.from_bytes(pool[pos:pos + width], 'big')
+            pos += width
+            if value < limit:
+                indices.append(value % bound)
+                break
+    return indices
 
 
 class PasswordValidator:
@@ -18,12 +65,34 @@ class PasswordValidator:
     REQUIRED_UPPERCASE = 1
     REQUIRED_SPECIAL = 1
     SPECIAL_CHARS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+    _SPECIAL_SET = frozenset(SPECIAL_CHARS)
+    
+    @classmethod
+    def _count_classes(cls, password: str) -> Tuple[int, int, int, int]:
+        """Count (uppercase, lowercase, digit, special) characters in a single pass."""
+        special_set = cls._SPECIAL_SET
+        up = lo = di = sp = 0
+        for c in password:
+            if c.isupper():
+                up += 1
+            elif c.islower():
+                lo += 1
+            elif c.isdigit():
+                di += 1
+            if c in special_set:
+                sp += 1
+        return up, lo, di, sp
     
     @classmethod
-    def validate(cls, password: str) -> Tuple[bool, List[str]]:
+    def validate(cls, password: str, fast_fail: bool = False) -> Tuple[bool, List[str]]:
         """
         Validate password against security requirements.
         
+        Args:
+            password: Password to check
+            fast_fail: Stop after the length check when the password is too short
+                (only that error is reported)
+        
         Returns:
             Tuple of (is_valid, list_of_errors)
         """
@@ -32,24 +101,25 @@ class PasswordValidator:
         # Check minimum length
         if len(password) < cls.MIN_LENGTH:
             errors.append(f"Password must be at least {cls.MIN_LENGTH} characters long")
+            if fast_fail:
+                return False, errors
+        
+        uppercase_count, _, _, special_count = cls._count_classes(password)
         
         # Check for uppercase letters
-        uppercase_count = sum(1 for c in password if c.isupper())
         if uppercase_count < cls.REQUIRED_UPPERCASE:
             errors.append(f"Password must contain at least {cls.REQUIRED_UPPERCASE} uppercase letter(s)")
         
         # Check for special characters
-        special_count = sum(1 for c in password if c in cls.SPECIAL_CHARS)
         if special_count < cls.REQUIRED_SPECIAL:
-            errors.append(f"Password must contain at least {cls.REQUIRED_SPECIAL} special character(s)")
-            errors.append(f"Special characters: {cls.SPECIAL_CHARS}")
+            errors.append(f"Password must contain at least {cls.REQUIRED_SPECIAL} special character(s): {cls.SPECIAL_CHARS}")
         
         # Check for common weak patterns
-        if password.lower() in ['password', '12345678', 'admin123', 'qwerty123']:
+        if password.lower() in _COMMON_PASSWORDS:
             errors.append("Password is too common and easily guessable")
         
         # Check for repeated characters (more than 3 in a row)
-        if re.search(r'(.)\1{3,}', password):
+        if _REPEAT_RE.search(password):
             errors.append("Password cannot contain more than 3 consecutive identical characters")
         
         return len(errors) == 0, errors
@@ -66,15 +136,96 @@ class PasswordValidator:
 
 
 class PasswordHasher:
-    """Handles password hashing and verification using bcrypt."""
+    """
+    Handles password hashing and verification.
+    
+    New hashes use Argon2id when argon2-cffi is installed and bcrypt otherwise;
+    verification accepts both formats so existing bcrypt hashes keep working.
+    Both libraries release the GIL while hashing, so concurrent logins from
+    different threads already run on separate cores without extra plumbing.
+    """
     
     # bcrypt work factor (cost parameter)
     ROUNDS = 12
     
+    # Prefixes of well-formed bcrypt hashes; anything else cannot match
+    _BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+    _checkpw = staticmethod(bcrypt.checkpw)
+    
+    # Argon2id parameters: 3 passes over 64 MiB with 4 lanes
+    ARGON2_TIME_COST = 3
+    ARGON2_MEMORY_COST = 65536
+    ARGON2_PARALLELISM = 4
+    
+    # Upper bound on passes chosen by calibrate_argon2
+    ARGON2_MAX_TIME_COST = 32
+    
+    _argon2 = (
+        _Argon2Hasher(time_cost=ARGON2_TIME_COST, memory_cost=ARGON2_MEMORY_COST,
+                      parallelism=ARGON2_PARALLELISM, type=_Argon2Type.ID)
+        if _Argon2Hasher is not None else None
+    )
+    
+    @classmethod
+    def argon2_available(cls) -> bool:
+        """Whether argon2-cffi is installed (otherwise bcrypt is used)."""
+        return _Argon2Hasher is not None
+    
+    @classmethod
+    def configure_argon2(cls, time_cost: int, memory_cost: int, parallelism: int) -> bool:
+        """
+        Use the given Argon2id parameters for new hashes.
+        
+        Existing hashes made with other parameters are reported by needs_rehash
+        and upgraded on the next successful login.
+        
+        Returns:
+            True if applied, False when argon2-cffi is not installed
+        """
+        if _Argon2Hasher is None:
+            return False
+        cls._argon2 = _Argon2Hasher(time_cost=time_cost, memory_cost=memory_cost,
+                                    parallelism=parallelism, type=_Argon2Type.ID)
+        return True
+    
+    @classmethod
+    def calibrate_argon2(cls, target_ms: float = 500.0) -> Optional[Dict[str, int]]:
+        """
+        Estimate the Argon2id time cost at which one hash takes about target_ms here.
+        
+        Times a single one-pass hash and extrapolates (hash time grows linearly
+        with passes), so calibration costs one cheap hash rather than a search.
+        The result is kept between ARGON2_TIME_COST and ARGON2_MAX_TIME_COST;
+        memory cost and parallelism stay fixed.
+        
+        Args:
+            target_ms: Desired duration of a single hash in milliseconds
+            
+        Returns:
+            Parameter dict for configure_argon2, or None without argon2-cffi
+        """
+        if _Argon2Hasher is None:
+            return None
+        
+        hasher = _Argon2Hasher(time_cost=1, memory_cost=cls.ARGON2_MEMORY_COST,
+                               parallelism=cls.ARGON2_PARALLELISM, type=_Argon2Type.ID)
+        start = time.perf_counter()
+        hasher.hash("benchmark")
+        pass_ms = max((time.perf_counter() - start) * 1000, 1.0)
+        
+        time_cost = min(cls.ARGON2_MAX_TIME_COST,
+                        max(cls.ARGON2_TIME_COST, math.ceil(target_ms / pass_ms)))
+        
+        return {
+            'time_cost': time_cost,
+            'memory_cost': cls.ARGON2_MEMORY_COST,
+            'parallelism': cls.ARGON2_PARALLELISM,
+        }
+    
     @classmethod
     def hash_password(cls, password: str) -> str:
         """
-        Hash a password using bcrypt.
+        Hash a password using Argon2id (or bcrypt when Argon2 is unavailable).
         
         Args:
             password: Plain text password
@@ -82,6 +233,9 @@ class PasswordHasher:
         Returns:
             Hashed password as string
         """
+        if cls._argon2 is not None:
+            return cls._argon2.hash(password)
+        
         # Convert password to bytes
         password_bytes = password.encode('utf-8')
         
@@ -99,17 +253,45 @@ class PasswordHasher:
         
         Args:
             password: Plain text password
-            hashed_password: Previously hashed password
+            hashed_password: Previously hashed password (Argon2 or bcrypt)
             
         Returns:
             True if password matches hash
         """
+        if hashed_password.startswith("$argon2"):
+            if cls._argon2 is None:
+                return False
+            try:
+                return cls._argon2.verify(hashed_password, password)
+            except (VerificationError, InvalidHashError):
+                return False
+        
+        if not hashed_password.startswith(cls._BCRYPT_PREFIXES):
+            return False
+        
+        password_bytes = password.encode('utf-8')
+        hashed_bytes = hashed_password.encode('utf-8')
         try:
-            password_bytes = password.encode('utf-8')
-            hashed_bytes = hashed_password.encode('utf-8')
-            return bcrypt.checkpw(password_bytes, hashed_bytes)
-        except (ValueError, TypeError):
+            return cls._checkpw(password_bytes, hashed_bytes)
+        except ValueError:
+            return False
+    
+    @classmethod
+    def needs_rehash(cls, hashed_password: str) -> bool:
+        """
+        Check whether a stored hash should be replaced after a successful login.
+        
+        True for legacy bcrypt hashes once Argon2 is available, and for Argon2
+        hashes made with different parameters than the current ones.
+        """
+        if cls._argon2 is None:
             return False
+        if not hashed_password.startswith("$argon2"):
+            return True
+        try:
+            return cls._argon2.check_needs_rehash(hashed_password)
+        except InvalidHashError:
+            return True
     
     @classmethod
     def generate_secure_password(cls, length: int = 12) -> str:
@@ -122,29 +304,31 @@ class PasswordHasher:
         Returns:
             Generated password
         """
-        if length < cls.MIN_LENGTH:
-            length = cls.MIN_LENGTH
+        if length < PasswordValidator.MIN_LENGTH:
+            length = PasswordValidator.MIN_LENGTH
         
         # Character pools
         lowercase = 'abcdefghijklmnopqrstuvwxyz'
         uppercase = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
         digits = '0123456789'
         special = PasswordValidator.SPECIAL_CHARS
+        all_chars = lowercase + uppercase + digits + special
         
-        # Ensure we have at least one from each required category
-        password_chars = []
+        # One index per draw: 1 uppercase, 1 special, the rest from all pools,
+        # then the Fisher-Yates swap positions for the shuffle
+        shuffle_bounds = range(length, 1, -1)
+        bounds = [len(uppercase), len(special)] + [len(all_chars)] * (length - 2) + list(shuffle_bounds)
+        indices = _urandom_indices(bounds)
         
-        # Add required characters
-        password_chars.append(secrets.choice(uppercase))  # At least 1 uppercase
-        password_chars.append(secrets.choice(special))    # At least 1 special
+        # Ensure we have at least one from each required category
+        password_chars = [uppercase[indices[0]], special[indices[1]]]
         
         # Fill remaining length with random characters from all pools
-        all_chars = lowercase + uppercase + digits + special
-        for _ in range(length - len(password_chars)):
-            password_chars.append(secrets.choice(all_chars))
+        password_chars.extend(all_chars[i] for i in indices[2:length])
         
         # Shuffle the password characters
-        secrets.SystemRandom().shuffle(password_chars)
+        for i, j in zip(range(length - 1, 0, -1), indices[length:]):
+            password_chars[i], password_chars[j] = password_chars[j], password_chars[i]
         
         return ''.join(password_chars)
 
@@ -173,10 +357,11 @@ class PasswordStrengthMeter:
             suggestions.append("Password is too short (minimum 8 characters)")
         
         # Character variety scoring
-        has_lower = any(c.islower() for c in password)
-        has_upper = any(c.isupper() for c in password)
-        has_digit = any(c.isdigit() for c in password)
-        has_special = any(c in PasswordValidator.SPECIAL_CHARS for c in password)
+        upper_count, lower_count, digit_count, special_count = PasswordValidator._count_classes(password)
+        has_lower = lower_count > 0
+        has_upper = upper_count > 0
+        has_digit = digit_count > 0
+        has_special = special_count > 0
         
         variety_score = sum([has_lower, has_upper, has_digit, has_special]) * 15
         score += variety_score
@@ -195,7 +380,7 @@ class PasswordStrengthMeter:
             score += 10
         
         # Penalty for common patterns
-        if re.search(r'123|abc|qwe|password', password.lower()):
+        if _WEAK_PATTERN_RE.search(password.lower()):
             score -= 20
             suggestions.append("Avoid common patterns")
         
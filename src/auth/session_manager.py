@@ -4,28 +4,168 @@ Session management for authentication system.
 Handles user sessions, tokens, and session persistence during CLI runtime.
 """
 
+import base64
+import hashlib
+import hmac
 import secrets
 import json
 import tempfile
 import os
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import threading
+import time
+import weakref
+from datetime import datetime
+from typing import Optional, Dict, Any, Tuple
 from pathlib import Path
 
 from .database import AuthDatabase
 
+try:
+    # Optional: faster session-file (de)serialization; stdlib json is used otherwise
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _unlink_quietly(path: str):
+    """Remove a file if it still exists (used as a finalizer)."""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _encode_session(session_data: Dict[str, Any]) -> bytes:
+    """Serialize session data for the session file."""
+    if orjson is not None:
+        return orjson.dumps(session_data)
+    return json.dumps(session_data).encode('utf-8')
+
+
+def _decode_session(raw: bytes) -> Dict[str, Any]:
+    """Parse the contents of a session file."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 class SessionManager:
-    """Manages user sessions and authentication tokens."""
+    """
+    Manages user sessions and authentication tokens.
+    
+    Tokens are HMAC-signed (username, expiry, nonce) so forged or expired
+    tokens are rejected without touching the database. The sessions table
+    remains the revocation store: a token is only valid while its row exists
+    (logout, user deletion and cleanup remove rows from any process).
+    """
+    
+    # HMAC-SHA256 key for signing session tokens, stored next to the user database
+    SESSION_SECRET_FILE = "session_secret.key"
+    SESSION_SECRET_BYTES = 32
+    
+    # Set to true to mirror the current session into a temp file (debugging/development)
+    SESSION_FILE_ENV = "UPS_SESSION_FILE_ENABLED"
+    
+    # Seconds a successful token validation is reused before checking again
+    VALIDATE_CACHE_TTL = 10.0
+    
+    # Expired sessions are purged at startup at most this often (across processes)
+    CLEANUP_INTERVAL_SECONDS = 3600
+    
+    # Databases whose expired sessions were already purged by this process
+    _cleaned_db_paths = set()
+    _cleanup_lock = threading.Lock()
     
     def __init__(self, db: Optional[AuthDatabase] = None):
         """Initialize session manager."""
         self.db = db or AuthDatabase()
+        if db is None:
+            # Close the connection on teardown only if this manager opened it
+            weakref.finalize(self, self.db.close)
         self._current_session = None
-        self._session_file = None
+        self._session_file = None  # Set once the file has actually been written
+        self._file_finalizer: Optional[weakref.finalize] = None
+        self._session_file_path = os.path.join(tempfile.gettempdir(), f"ups_session_{os.getpid()}.json")
+        self._secret = self._load_session_secret()
         
-        # Clean up expired sessions on startup
-        self.db.cleanup_expired_sessions()
+        # Signed tokens logged out or replaced by this process
+        self._revoked_tokens = set()
+        
+        # token -> (username, monotonic validation time, expiry as Unix time);
+        # dropped on logout/extend
+        self._validate_cache: Dict[str, Tuple[str, float, float]] = {}
+        
+        # Until when (Unix time) the current session is trusted without a recheck:
+        # its expiry, capped at VALIDATE_CACHE_TTL after the last validation
+        self._auth_valid_until: Optional[float] = None
+        
+        # Clean up expired sessions on startup (once per database per process, and
+        # only if no process has done so within CLEANUP_INTERVAL_SECONDS)
+        with self._cleanup_lock:
+            needs_cleanup = self.db.db_path not in self._cleaned_db_paths
+            self._cleaned_db_paths.add(self.db.db_path)
+        if needs_cleanup:
+            self.db.cleanup_expired_sessions_if_due(self.CLEANUP_INTERVAL_SECONDS)
+    
+    def _load_session_secret(self) -> bytes:
+        """Read the token-signing key, creating it (owner-only) on first use."""
+        if self.db.db_path == ":memory:":
+            return secrets.token_bytes(self.SESSION_SECRET_BYTES)
+        
+        secret_path = Path(self.db.db_path).parent / self.SESSION_SECRET_FILE
+        for _ in range(5):
+            try:
+                secret = secret_path.read_bytes()
+            except FileNotFoundError:
+                secret = None
+            except OSError:
+                break
+            if secret is not None and len(secret) == self.SESSION_SECRET_BYTES:
+                return secret
+            
+            # Missing, empty or truncated: never sign with it. The new key is
+            # written to a temp file first so no process can read a partial key.
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=secret_path.parent, prefix=".session_secret.")
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(secrets.token_bytes(self.SESSION_SECRET_BYTES))
+                    if secret is None:
+                        # Fails if another process published its key first
+                        os.link(tmp_path, secret_path)
+                    else:
+                        os.replace(tmp_path, secret_path)
+                finally:
+                    _unlink_quietly(tmp_path)
+            except FileExistsError:
+                pass
+            except OSError:
+                break
+            # Re-read so every process ends up signing with the published key
+        
+        # Can't persist a key: tokens are then only valid within this process
+        return secrets.token_bytes(self.SESSION_SECRET_BYTES)
+    
+    def _new_token(self, username: str, expires_ts: float) -> str:
+        """Build a signed token: base64(username|expiry|nonce).hex(HMAC-SHA256)."""
+        payload = f"{username}|{int(expires_ts)}|{secrets.token_hex(8)}".encode('utf-8')
+        signature = hmac.new(self._secret, payload, hashlib.sha256).hexdigest()
+        return f"{base64.urlsafe_b64encode(payload).decode('ascii')}.{signature}"
+    
+    def _verify_token(self, session_token: str) -> Optional[str]:
+        """Check a signed token's signature and expiry; return its username if valid."""
+        payload_b64, _, signature = session_token.partition('.')
+        try:
+            payload = base64.urlsafe_b64decode(payload_b64)
+            expected = hmac.new(self._secret, payload, hashlib.sha256).hexdigest()
+            if not hmac.compare_digest(expected, signature):
+                return None
+            username, expires_ts, _ = payload.decode('utf-8').rsplit('|', 2)
+            if int(expires_ts) <= time.time():
+                return None
+        except (ValueError, TypeError):
+            return None
+        return username
     
     def create_session(self, username: str, duration_hours: int = 8) -> str:
         """
@@ -38,28 +178,58 @@ class SessionManager:
         Returns:
             Session token
         """
-        # Generate secure random token
-        session_token = secrets.token_urlsafe(32)
+        # Generate signed token
+        session_token = self._new_token(username, time.time() + duration_hours * 3600)
         
         # Store in database
         success = self.db.create_session(username, session_token, duration_hours)
         
         if success:
-            # Store current session info
-            self._current_session = {
-                'username': username,
-                'token': session_token,
-                'expires_at': (datetime.now() + timedelta(hours=duration_hours)).isoformat(),
-                'created_at': datetime.now().isoformat()
-            }
-            
-            # Create temporary session file for this CLI run
-            self._create_session_file()
+            self._activate_session(username, session_token, duration_hours)
+            return session_token
+        else:
+            raise RuntimeError("Failed to create session")
+    
+    def create_login_session(self, username: str, duration_hours: int = 8) -> str:
+        """
+        Create the session for a successful login.
+        
+        The failed-attempt reset, last-login stamp and session insert are
+        written in a single database transaction.
+        
+        Args:
+            username: Username that just authenticated
+            duration_hours: Session duration in hours
             
+        Returns:
+            Session token
+        """
+        session_token = self._new_token(username, time.time() + duration_hours * 3600)
+        
+        if self.db.finalize_successful_login(username, session_token, duration_hours):
+            self._activate_session(username, session_token, duration_hours)
             return session_token
         else:
             raise RuntimeError("Failed to create session")
     
+    def _activate_session(self, username: str, session_token: str, duration_hours: int):
+        """Make a stored session the current one for this CLI run."""
+        now = time.time()
+        expires_ts = now + duration_hours * 3600
+        
+        # Store current session info ('expires_at_ts' is in-memory only; the file gets the ISO string)
+        self._current_session = {
+            'username': username,
+            'token': session_token,
+            'expires_at': datetime.fromtimestamp(expires_ts).isoformat(),
+            'created_at': datetime.fromtimestamp(now).isoformat(),
+            'expires_at_ts': expires_ts
+        }
+        self._remember_valid(session_token, username, expires_ts)
+        
+        # Create temporary session file for this CLI run
+        self._create_session_file()
+    
     def validate_session(self, session_token: Optional[str] = None) -> Optional[str]:
         """
         Validate a session token.
@@ -77,15 +247,44 @@ class SessionManager:
         if not session_token:
             return None
         
-        # Check database
-        username = self.db.validate_session(session_token)
+        if session_token in self._revoked_tokens:
+            return None
+        
+        now = time.monotonic()
+        cached = self._validate_cache.get(session_token)
+        if (cached is not None and now - cached[1] < self.VALIDATE_CACHE_TTL
+                and time.time() < cached[2]):
+            username = cached[0]
+        else:
+            session = None
+            if '.' not in session_token or self._verify_token(session_token):
+                # Signed tokens must also still have their session row; opaque
+                # tokens (issued before signing) are checked there only
+                session = self.db.get_valid_session(session_token)
+            
+            if session:
+                username, seconds_left = session
+                self._remember_valid(session_token, username, time.time() + seconds_left)
+            else:
+                username = None
+                self._validate_cache.pop(session_token, None)
         
         # Update current session if valid
-        if username and self._current_session and self._current_session['token'] == session_token:
-            self._current_session['last_accessed'] = datetime.now().isoformat()
+        if self._current_session and self._current_session['token'] == session_token:
+            if username:
+                self._current_session['last_accessed_ts'] = time.time()
+            else:
+                self._auth_valid_until = None
         
         return username
     
+    def _remember_valid(self, session_token: str, username: str, expires_ts: float):
+        """Cache a successful validation (for at most VALIDATE_CACHE_TTL seconds)."""
+        self._validate_cache[session_token] = (username, time.monotonic(), expires_ts)
+        if self._current_session and self._current_session['token'] == session_token:
+            # Recheck the database periodically so revocations by other processes apply
+            self._auth_valid_until = min(expires_ts, time.time() + self.VALIDATE_CACHE_TTL)
+    
     def get_current_user(self) -> Optional[str]:
         """Get currently authenticated user."""
         if self._current_session:
@@ -101,16 +300,21 @@ class SessionManager:
     
     def is_authenticated(self) -> bool:
         """Check if there's a valid current session."""
+        if self._auth_valid_until is not None and time.time() < self._auth_valid_until:
+            return True
         return self.get_current_user() is not None
     
     def logout(self):
         """Logout current user and invalidate session."""
         if self._current_session:
             # Remove from database
+            self._revoked_tokens.add(self._current_session['token'])
+            self._validate_cache.pop(self._current_session['token'], None)
             self.db.delete_session(self._current_session['token'])
             
             # Clear current session
             self._current_session = None
+            self._auth_valid_until = None
             
             # Remove session file
             self._remove_session_file()
@@ -124,15 +328,14 @@ class SessionManager:
         if not username:
             return None
         
-        expires_at = datetime.fromisoformat(self._current_session['expires_at'])
-        time_left = expires_at - datetime.now()
+        time_left = self._current_session['expires_at_ts'] - time.time()
         
         return {
             'username': username,
             'created_at': self._current_session['created_at'],
             'expires_at': self._current_session['expires_at'],
-            'time_left_minutes': int(time_left.total_seconds() / 60),
-            'time_left_hours': round(time_left.total_seconds() / 3600, 1)
+            'time_left_minutes': int(time_left / 60),
+            'time_left_hours': round(time_left / 3600, 1)
         }
     
     def extend_session(self, additional_hours: int = 4) -> bool:
@@ -152,17 +355,26 @@ class SessionManager:
         if not username:
             return False
         
-        # Create new session with extended time
+        # Re-sign and extend the current session row in place. The expiry is part
+        # of the signed token, so a new token replaces the old one.
         try:
-            # Delete current session
-            self.db.delete_session(self._current_session['token'])
+            old_token = self._current_session['token']
+            new_expires_ts = self._current_session['expires_at_ts'] + additional_hours * 3600
+            new_expires = datetime.fromtimestamp(new_expires_ts)
+            new_token = self._new_token(username, new_expires_ts)
             
-            # Create new extended session
-            current_expires = datetime.fromisoformat(self._current_session['expires_at'])
-            time_left = current_expires - datetime.now()
-            total_hours = int(time_left.total_seconds() / 3600) + additional_hours
+            if not self.db.extend_session(old_token, new_token, new_expires):
+                return False
             
-            new_token = self.create_session(username, total_hours)
+            self._revoked_tokens.add(old_token)
+            self._validate_cache.pop(old_token, None)
+            self._current_session.update(
+                token=new_token,
+                expires_at=new_expires.isoformat(),
+                expires_at_ts=new_expires_ts
+            )
+            self._remember_valid(new_token, username, new_expires_ts)
+            self._create_session_file()
             return True
             
         except Exception:
@@ -172,76 +384,90 @@ class SessionManager:
         """Remove expired sessions from database."""
         self.db.cleanup_expired_sessions()
     
+    def _session_file_enabled(self) -> bool:
+        """Whether the debug session file is enabled via SESSION_FILE_ENV."""
+        return os.getenv(self.SESSION_FILE_ENV, '').lower() in ('1', 'true', 'yes')
+    
     def _create_session_file(self):
-        """Create temporary session file for CLI run."""
-        if self._current_session:
+        """Create temporary session file for CLI run (only when SESSION_FILE_ENV is set)."""
+        if self._current_session and self._session_file_enabled():
             try:
-                # Create temp file
-                temp_dir = tempfile.gettempdir()
-                session_file = os.path.join(temp_dir, f"ups_session_{os.getpid()}.json")
+                session_file = self._session_file_path
                 
-                with open(session_file, 'w') as f:
-                    json.dump(self._current_session, f)
+                session_data = {key: value for key, value in self._current_session.items()
+                                if key != 'expires_at_ts'}
                 
-                self._session_file = session_file
+                # Write a sibling temp file and rename it over the target, so a reader
+                # never sees a partially written session file
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(session_file),
+                                                prefix=f"ups_session_{os.getpid()}_",
+                                                suffix=".tmp")
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(_encode_session(session_data))
+                    os.replace(tmp_path, session_file)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+                
+                self._track_session_file(session_file)
                 
             except Exception:
                 # If we can't create session file, continue without it
                 pass
     
+    def _track_session_file(self, session_file: str):
+        """Remember the session file and remove it when this manager is collected or at exit."""
+        self._session_file = session_file
+        if self._file_finalizer is None:
+            self._file_finalizer = weakref.finalize(self, _unlink_quietly, session_file)
+    
     def _remove_session_file(self):
         """Remove temporary session file."""
-        if self._session_file and os.path.exists(self._session_file):
-            try:
-                os.remove(self._session_file)
-            except Exception:
-                pass
-            finally:
-                self._session_file = None
+        if self._file_finalizer is not None:
+            self._file_finalizer()  # Unlinks the file; a no-op if it already ran
+            self._file_finalizer = None
+        self._session_file = None
     
     def restore_session_from_file(self) -> bool:
         """
         Attempt to restore session from temporary file.
-        Used for debugging/development only.
+        Used for debugging/development only; requires SESSION_FILE_ENV.
         
         Returns:
             True if session restored
         """
+        if not self._session_file_enabled():
+            return False
+        
+        session_file = self._session_file_path
         try:
-            # Look for session files in temp directory
-            temp_dir = tempfile.gettempdir()
-            session_pattern = f"ups_session_{os.getpid()}.json"
-            session_file = os.path.join(temp_dir, session_pattern)
+            with open(session_file, 'rb') as f:
+                session_data = _decode_session(f.read())
             
-            if os.path.exists(session_file):
-                with open(session_file, 'r') as f:
-                    session_data = json.load(f)
-                
-                # Validate the session is still valid
-                username = self.db.validate_session(session_data['token'])
-                if username:
-                    self._current_session = session_data
-                    self._session_file = session_file
-                    return True
-                else:
-                    # Session expired, remove file
-                    os.remove(session_file)
+            # Validate the session is still valid
+            username = self.validate_session(session_data['token'])
+            if username:
+                session_data['expires_at_ts'] = datetime.fromisoformat(session_data['expires_at']).timestamp()
+                self._current_session = session_data
+                self._track_session_file(session_file)
+                return True
+            else:
+                # Session expired, remove file
+                os.unlink(session_file)
             
             return False
             
         except Exception:
+            # No session file (FileNotFoundError) or an unreadable one
             return False
     
     def get_session_stats(self) -> Dict[str, Any]:
         """Get session statistics for monitoring."""
-        with self.db._get_connection() if hasattr(self.db, '_get_connection') else self.db.db_path as conn:
-            # This is a simplified version - you might want to add more stats
-            return {
-                'current_user': self.get_current_user(),
-                'is_authenticated': self.is_authenticated(),
-                'session_info': self.get_session_info()
-            }
-    
-    def __del__(self):
-        """Cleanup on destruction."""
-        self._remove_session_file()
\ No newline at end of file
+        # One validation covers all three fields
+        info = self.get_session_info()
+        return {
+            'current_user': info['username'] if info else None,
+            'is_authenticated': info is not None,
+            'session_info': info
+        }
\ No newline at end of file
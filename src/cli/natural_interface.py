@@ -3,28 +3,82 @@ Natural Language CLI Interface for Universal Product Scraper
 Provides user-friendly, conversational interaction with 1,2,3 or A,B,C choices
 """
 
+import bisect
+import functools
 import os
+import re
 import sys
+import threading
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from itertools import islice
 import time
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.utils.logger import get_logger
-from src.api.scraper_service import ScraperService
-from src.api.validation_service import ValidationService
-from src.api.results_service import ResultsService
-from src.api.status_service import StatusService
-from src.api.summary_service import SummaryService
 
 logger = get_logger(__name__)
 
 # Detect if running from PyInstaller executable
 RUNNING_FROM_EXECUTABLE = getattr(sys, 'frozen', False)
 
+DEFAULT_SOURCE_FILE = "data/SOURCE.xlsx"
+
+# Resolved once: the bundled config doesn't come and go while the CLI runs
+_DEFAULT_CONFIG_PATH = "config/default_config.json" if os.path.exists("config/default_config.json") else None
+
+# Banner separators, built once instead of on every menu render
+WIDE_SEPARATOR = "=" * 70
+WIDE_DIVIDER = "-" * 70
+SEPARATOR = "=" * 50
+DIVIDER = "-" * 50
+
+# Static menu text, joined once at import
+WELCOME_HEADER = "\n".join([
+    "\n" + WIDE_SEPARATOR,
+    "🚀 UNIVERSAL PRODUCT SCRAPER - Natural Language Interface",
+    WIDE_SEPARATOR,
+    "Welcome! I'll help you scrape product prices from ZAP.co.il",
+    "using simple, conversational prompts.",
+])
+
+MAIN_MENU_TEXT = "\n".join([
+    "\n🔧 What would you like to do today?",
+    "\n1. 📊 Configure a custom scraping session",
+    "2. ⚡ Quick scraping wizard (guided setup)",
+    "3. 📈 View recent scraping results",
+    "4. 🔍 Check system status and performance",
+    "5. ❓ Help and examples",
+    "6. 🔐 Logout",
+    "7. 🚪 Exit",
+]) + "\n"
+
+WIZARD_MENU_TEXT = "\n".join([
+    "\n" + SEPARATOR,
+    "⚡ QUICK SCRAPING WIZARD",
+    SEPARATOR,
+    "I'll help you set up scraping quickly with smart defaults!",
+    "\nWhat type of scraping do you want to do?",
+    "\nA. 🧪 Quick test (2 products, ~10 minutes, visible browser)",
+    "B. 📊 Small batch (6-10 products, your choice of mode)",
+    "C. 🚀 Large batch (11+ products, headless mode)",
+    "D. 🔍 Single product validation",
+]) + "\n"
+
+# Quick-test product lookup, applied to lowercased names. Keywords may appear
+# anywhere in the name, like plain substring checks.
+_OPTIMAL_TEST_PRODUCT_RE = re.compile(r'(?=.*wd)(?=.*150)(?=.*3ph)', re.S)
+_SIMILAR_TEST_PRODUCT_RE = re.compile(r'(?=.*wd)(?=.*(?:150|3ph))', re.S)
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_exists(path: str) -> bool:
+    """os.path.exists memoized for the current menu pass (cleared by the main loop)."""
+    return os.path.exists(path)
+
 
 class NaturalLanguageCLI:
     """Natural language interface for the Universal Product Scraper."""
@@ -40,19 +94,60 @@ class NaturalLanguageCLI:
         }
         self.auth_manager = None
         
-        # Initialize API services
-        self.scraper_service = ScraperService()
-        self.validation_service = ValidationService()
-        self.results_service = ResultsService()
-        self.status_service = StatusService()
-        self.summary_service = SummaryService()
+        # Excel listings per directory, keyed by the directory's mtime
+        self._dir_cache: Dict[str, Tuple[int, List[str]]] = {}
+        # Parsed source products, keyed by (path, workbook mtime)
+        self._source_cache: Dict[Tuple[str, int], list] = {}
+        # Background parse of the default source file (see _start_source_prefetch)
+        self._prefetch_thread: Optional[threading.Thread] = None
+        self._scraper_service = None
+        self._scraper_service_lock = threading.Lock()
+    
+    # API services are created on first use so that menus which don't need
+    # them (help, logout) don't pay for importing openpyxl/psutil.
+    @property
+    def scraper_service(self):
+        """Scraper API service (also created from the source prefetch thread, hence the lock)."""
+        if self._scraper_service is None:
+            with self._scraper_service_lock:
+                if self._scraper_service is None:
+                    from src.api.scraper_service import ScraperService
+                    self._scraper_service = ScraperService()
+        return self._scraper_service
+    
+    @functools.cached_property
+    def validation_service(self):
+        """Validation API service."""
+        from src.api.validation_service import ValidationService
+        return ValidationService()
+    
+    @functools.cached_property
+    def results_service(self):
+        """Results API service."""
+        from src.api.results_service import ResultsService
+        return ResultsService()
+    
+    @functools.cached_property
+    def status_service(self):
+        """Status API service."""
+        from src.api.status_service import StatusService
+        return StatusService()
+    
+    @functools.cached_property
+    def summary_service(self):
+        """Summary API service."""
+        from src.api.summary_service import SummaryService
+        return SummaryService()
         
     def start_interactive_session(self, auth_manager=None):
         """Start the main interactive session."""
         self.auth_manager = auth_manager
+        self._start_source_prefetch()
         self.print_welcome()
         
         while True:
+            # Files may have been added or removed since the last pass
+            _cached_exists.cache_clear()
             try:
                 # Main menu
                 choice = self.show_main_menu()
@@ -89,39 +184,41 @@ class NaturalLanguageCLI:
             except Exception as e:
                 logger.error(f"Error in interactive session: {e}")
                 print(f"\n❌ An error occurred: {e}")
-                input("\nPress Enter to continue...")
+                self._prompt("\nPress Enter to continue...")
+    
+    def _prompt(self, message: str) -> str:
+        """Write a prompt and read one line from stdin (input() without the extra stream work)."""
+        sys.stdout.write(message)
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if not line:
+            # Match input(): stop the menu loops on a closed stdin
+            raise EOFError("EOF when reading a line")
+        return line[:-1] if line.endswith('\n') else line
     
     def print_welcome(self):
         """Print welcome message and system overview."""
-        print("\n" + "="*70)
-        print("🚀 UNIVERSAL PRODUCT SCRAPER - Natural Language Interface")
-        print("="*70)
-        print("Welcome! I'll help you scrape product prices from ZAP.co.il")
-        print("using simple, conversational prompts.")
-        print(f"\n📅 Session started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        lines = [
+            WELCOME_HEADER,
+            f"\n📅 Session started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        ]
         
         # Show authentication info if available
         if self.auth_manager:
             current_user = self.auth_manager.get_current_user()
             session_info = self.auth_manager.session_manager.get_session_info()
             if current_user and session_info:
-                print(f"👤 Logged in as: {current_user}")
-                print(f"🕐 Session expires in: {session_info['time_left_hours']} hours")
+                lines.append(f"👤 Logged in as: {current_user}")
+                lines.append(f"🕐 Session expires in: {session_info['time_left_hours']} hours")
         
-        print("-"*70)
+        lines.append(WIDE_DIVIDER)
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def show_main_menu(self) -> str:
         """Show main menu and get user choice."""
-        print("\n🔧 What would you like to do today?")
-        print("\n1. 📊 Configure a custom scraping session")
-        print("2. ⚡ Quick scraping wizard (guided setup)")
-        print("3. 📈 View recent scraping results")
-        print("4. 🔍 Check system status and performance")
-        print("5. ❓ Help and examples")
-        print("6. 🔐 Logout")
-        print("7. 🚪 Exit")
-        
-        choice = input("\n👉 Please enter your choice (1-7): ").strip()
+        sys.stdout.write(MAIN_MENU_TEXT)
+        
+        choice = self._prompt("\n👉 Please enter your choice (1-7): ").strip()
         return choice
     
     def configure_scraping_session(self):
@@ -161,18 +258,9 @@ class NaturalLanguageCLI:
     
     def quick_scraping_wizard(self):
         """Quick wizard for common scraping tasks."""
-        print("\n" + "="*50)
-        print("⚡ QUICK SCRAPING WIZARD")
-        print("="*50)
-        
-        print("I'll help you set up scraping quickly with smart defaults!")
-        print("\nWhat type of scraping do you want to do?")
-        print("\nA. 🧪 Quick test (2 products, ~10 minutes, visible browser)")
-        print("B. 📊 Small batch (6-10 products, your choice of mode)")  
-        print("C. 🚀 Large batch (11+ products, headless mode)")
-        print("D. 🔍 Single product validation")
+        sys.stdout.write(WIZARD_MENU_TEXT)
         
-        choice = input("\n👉 Choose your scraping type (A/B/C/D): ").strip().upper()
+        choice = self._prompt("\n👉 Choose your scraping type (A/B/C/D): ").strip().upper()
         
         if choice == 'A':
             self.quick_test_scraping()
@@ -190,64 +278,40 @@ class NaturalLanguageCLI:
         print("\n📁 Let's find your product list (Excel file)")
         
         # Check for default SOURCE.xlsx
-        default_source = "data/SOURCE.xlsx"
-        if os.path.exists(default_source):
+        default_source = DEFAULT_SOURCE_FILE
+        if _cached_exists(default_source):
             print(f"\n✅ Found default source file: {default_source}")
-            choice = input("👉 Use this file? (Y/N): ").strip().lower()
+            choice = self._prompt("👉 Use this file? (Y/N): ").strip().lower()
             if choice in ['', 'y', 'yes']:
                 return default_source
         
         # Manual file selection
-        print("\n📂 Available options:")
-        print("1. Enter custom file path")
-        print("2. Browse data/ directory")
-        print("3. Cancel")
-        print("\n💡 TIP: You can paste a full file path directly (no need to choose option 1 first)")
-        print("   Example: C:\\Users\\USER\\Google Drive\\SW_PLATFORM\\...\\SOURCE.xlsx")
+        lines = [
+            "\n📂 Available options:",
+            "1. Enter custom file path",
+            "2. Browse data/ directory",
+            "3. Cancel",
+            "\n💡 TIP: You can paste a full file path directly (no need to choose option 1 first)",
+            "   Example: C:\\Users\\USER\\Google Drive\\SW_PLATFORM\\...\\SOURCE.xlsx",
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
         
-        choice = input("\n👉 Enter choice (1-3) OR paste full file path: ").strip()
+        choice = self._prompt("\n👉 Enter choice (1-3) OR paste full file path: ").strip()
         
         # Smart input detection: Check if input looks like a file path
         if self._is_file_path(choice):
             # User entered a file path directly
             print(f"📁 Detected file path: {choice}")
             
-            # Handle different path formats for external computers
-            normalized_path = self._normalize_file_path(choice)
-            
-            if os.path.exists(normalized_path):
-                print(f"✅ File found and verified!")
-                return normalized_path
-            elif os.path.exists(choice):
+            resolved = self._try_resolve_path(choice)
+            if resolved:
                 print(f"✅ File found and verified!")
-                return choice
-            else:
-                print(f"❌ File not found: {choice}")
-                # Suggest potential fixes for common path issues
-                suggestions = self._suggest_path_fixes(choice)
-                if suggestions:
-                    print("💡 Possible fixes:")
-                    for suggestion in suggestions:
-                        print(f"   • {suggestion}")
-                return None
+            return resolved
         
         # Traditional menu option handling
         elif choice == '1':
-            file_path = input("📁 Enter full path to your Excel file: ").strip()
-            normalized_path = self._normalize_file_path(file_path)
-            
-            if os.path.exists(normalized_path):
-                return normalized_path
-            elif os.path.exists(file_path):
-                return file_path
-            else:
-                print(f"❌ File not found: {file_path}")
-                suggestions = self._suggest_path_fixes(file_path)
-                if suggestions:
-                    print("💡 Possible fixes:")
-                    for suggestion in suggestions:
-                        print(f"   • {suggestion}")
-                return None
+            file_path = self._prompt("📁 Enter full path to your Excel file: ").strip()
+            return self._try_resolve_path(file_path)
                 
         elif choice == '2':
             return self.browse_data_directory()
@@ -259,41 +323,56 @@ class NaturalLanguageCLI:
             # Check if it might be a path that we failed to detect
             if len(choice) > 10 and ('\\' in choice or '/' in choice):
                 print(f"🤔 Input looks like it might be a file path: '{choice[:50]}...'")
-                try_anyway = input("👉 Try to use it as a file path anyway? (y/N): ").strip().lower()
+                try_anyway = self._prompt("👉 Try to use it as a file path anyway? (y/N): ").strip().lower()
                 if try_anyway in ['y', 'yes']:
                     # Process as if it were detected as a file path
-                    normalized_path = self._normalize_file_path(choice)
-                    
-                    if os.path.exists(normalized_path):
-                        print(f"✅ File found and verified!")
-                        return normalized_path
-                    elif os.path.exists(choice):
+                    resolved = self._try_resolve_path(choice)
+                    if resolved:
                         print(f"✅ File found and verified!")
-                        return choice
-                    else:
-                        print(f"❌ File not found: {choice}")
-                        suggestions = self._suggest_path_fixes(choice)
-                        if suggestions:
-                            print("💡 Possible fixes:")
-                            for suggestion in suggestions:
-                                print(f"   • {suggestion}")
-                        return None
-            
-            print(f"❌ Invalid input: '{choice}'")
-            print("💡 Please enter either:")
-            print("   • A number (1, 2, or 3)")
-            print("   • A full file path (like: C:\\Users\\USER\\Google Drive\\...\\file.xlsx)")
-            print("   • Try option 1 to enter the path step-by-step")
+                    return resolved
+            
+            lines = [
+                f"❌ Invalid input: '{choice}'",
+                "💡 Please enter either:",
+                "   • A number (1, 2, or 3)",
+                "   • A full file path (like: C:\\Users\\USER\\Google Drive\\...\\file.xlsx)",
+                "   • Try option 1 to enter the path step-by-step",
+            ]
+            sys.stdout.write("\n".join(lines) + "\n")
             return None
     
+    def _try_resolve_path(self, candidate: str) -> Optional[str]:
+        """Resolve a user-entered path, printing fix suggestions if it doesn't exist."""
+        # Handle different path formats for external computers
+        for path in (self._normalize_file_path(candidate), candidate):
+            if _cached_exists(path):
+                return path
+        
+        print(f"❌ File not found: {candidate}")
+        # Suggest potential fixes for common path issues
+        suggestions = self._suggest_path_fixes(candidate)
+        if suggestions:
+            print("💡 Possible fixes:")
+            for suggestion in suggestions:
+                print(f"   • {suggestion}")
+        return None
+    
     def browse_data_directory(self) -> Optional[str]:
         """Browse data directory for Excel files."""
         data_dir = "data"
-        if not os.path.exists(data_dir):
+        if not _cached_exists(data_dir):
             print(f"❌ Data directory not found: {data_dir}")
             return None
             
-        excel_files = [f for f in os.listdir(data_dir) if f.endswith(('.xlsx', '.xls'))]
+        mtime_ns = os.stat(data_dir).st_mtime_ns
+        cached = self._dir_cache.get(data_dir)
+        if cached and cached[0] == mtime_ns:
+            excel_files = cached[1]
+        else:
+            with os.scandir(data_dir) as entries:
+                excel_files = [e.name for e in entries
+                               if e.name.endswith(('.xlsx', '.xls')) and e.is_file()]
+            self._dir_cache[data_dir] = (mtime_ns, excel_files)
         
         if not excel_files:
             print(f"❌ No Excel files found in {data_dir}/")
@@ -304,7 +383,7 @@ class NaturalLanguageCLI:
             print(f"{i}. {file}")
             
         try:
-            choice = int(input(f"\n👉 Choose file (1-{len(excel_files)}): ").strip())
+            choice = int(self._prompt(f"\n👉 Choose file (1-{len(excel_files)}): ").strip())
             if 1 <= choice <= len(excel_files):
                 return os.path.join(data_dir, excel_files[choice-1])
             else:
@@ -319,7 +398,7 @@ class NaturalLanguageCLI:
         print(f"\n🔍 Analyzing source file: {source_file}")
         
         try:
-            products = self.scraper_service.get_source_products(source_file)
+            products = self._get_source_products(source_file)
             
             if not products:
                 print("❌ No valid products found in the file")
@@ -331,7 +410,7 @@ class NaturalLanguageCLI:
             
             # Show first few products as examples
             print("\n📋 First few products:")
-            for i, product in enumerate(products[:5]):
+            for product in islice(products, 5):
                 print(f"   Row {product.row_number}: {product.name} (₪{product.original_price})")
                 
             if total_products > 5:
@@ -340,6 +419,8 @@ class NaturalLanguageCLI:
             return {
                 'total_products': total_products,
                 'products': products,
+                'names_lower': [p.name.lower() for p in products],
+                'row_numbers': sorted(p.row_number for p in products),
                 'first_row': products[0].row_number,
                 'last_row': products[-1].row_number
             }
@@ -348,6 +429,43 @@ class NaturalLanguageCLI:
             print(f"❌ Error reading file: {e}")
             return None
     
+    def _start_source_prefetch(self):
+        """Parse the default source file in the background while the user reads the menus."""
+        if self._prefetch_thread is not None or not _cached_exists(DEFAULT_SOURCE_FILE):
+            return
+        self._prefetch_thread = threading.Thread(
+            target=self._prefetch_default_source, name="source-prefetch", daemon=True
+        )
+        self._prefetch_thread.start()
+    
+    def _prefetch_default_source(self):
+        """Fill the source cache for the default file; errors resurface on the real read."""
+        try:
+            self._get_source_products(DEFAULT_SOURCE_FILE)
+        except Exception as e:
+            logger.debug(f"Source prefetch failed: {e}")
+    
+    def _get_source_products(self, source_file: str) -> list:
+        """Read source products, reusing the parsed list while the workbook is unchanged."""
+        prefetch = self._prefetch_thread
+        if (source_file == DEFAULT_SOURCE_FILE and prefetch is not None
+                and prefetch is not threading.current_thread()):
+            # Wait for the background parse instead of reading the workbook twice
+            prefetch.join()
+        
+        try:
+            mtime_ns = os.stat(self.scraper_service.project_root / source_file).st_mtime_ns
+        except OSError:
+            # Let the service report the missing/unreadable file
+            return self.scraper_service.get_source_products(source_file)
+        
+        key = (source_file, mtime_ns)
+        products = self._source_cache.get(key)
+        if products is None:
+            products = self.scraper_service.get_source_products(source_file)
+            self._source_cache[key] = products
+        return products
+    
     def choose_products_to_scrape(self, products_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Let user choose which products to scrape."""
         total = products_info['total_products']
@@ -363,7 +481,7 @@ class NaturalLanguageCLI:
         print("3. 🎯 Custom range (you specify start and end)")
         print("4. 🚀 All products (full processing)")
         
-        choice = input("\n👉 Choose option (1-4): ").strip()
+        choice = self._prompt("\n👉 Choose option (1-4): ").strip()
         
         if choice == '1':
             # Quick test with 2 products - let user choose which ones
@@ -387,7 +505,7 @@ class NaturalLanguageCLI:
             print(f"\n⚠️  Processing all {total} products will take significant time!")
             print(f"   Estimated time: {self.estimate_processing_time(total)}")
             
-            confirm = input("👉 Are you sure? (y/N): ").strip().lower()
+            confirm = self._prompt("👉 Are you sure? (y/N): ").strip().lower()
             if confirm in ['y', 'yes']:
                 return {
                     'type': 'all',
@@ -414,7 +532,7 @@ class NaturalLanguageCLI:
         print(f"A. 🎯 Optimal test product (WD 150 3PH - minimal vendors, ~5 min)")
         print(f"B. 🔍 I'll choose 2 specific rows for testing")
         
-        choice = input(f"\n👉 Choose option (A/B): ").strip().upper()
+        choice = self._prompt(f"\n👉 Choose option (A/B): ").strip().upper()
         
         if choice == 'A':
             # Find "wd 150 3ph" for optimal quick testing (only 2 vendors)
@@ -441,14 +559,14 @@ class NaturalLanguageCLI:
     def _find_optimal_test_product(self, products_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Find optimal test product (WD 150 3PH) that has minimal vendors for quick testing."""
         products = products_info['products']
+        names_lower = products_info.get('names_lower') or [p.name.lower() for p in products]
         
         # Search for "wd 150 3ph" (case-insensitive, flexible matching)
-        target_keywords = ['wd', '150', '3ph']
-        
-        for product in products:
-            product_name_lower = product.name.lower()
+        # Single pass: an exact match wins outright, otherwise keep the first similar one
+        similar = None
+        for product, product_name_lower in zip(products, names_lower):
             # Check if all keywords are present in the product name
-            if all(keyword in product_name_lower for keyword in target_keywords):
+            if _OPTIMAL_TEST_PRODUCT_RE.match(product_name_lower):
                 print(f"\n✅ Found optimal test product: {product.name} (Row {product.row_number})")
                 print(f"   This product has minimal vendors (~2) for fast testing")
                 
@@ -459,21 +577,22 @@ class NaturalLanguageCLI:
                     'product_count': 1,
                     'description': f'Row {product.row_number}: {product.name} (optimal for testing)'
                 }
+            
+            if similar is None and _SIMILAR_TEST_PRODUCT_RE.match(product_name_lower):
+                similar = product
         
-        # If not found, look for similar patterns
-        for product in products:
-            product_name_lower = product.name.lower()
-            if 'wd' in product_name_lower and ('150' in product_name_lower or '3ph' in product_name_lower):
-                print(f"\n⚡ Found similar test product: {product.name} (Row {product.row_number})")
-                print(f"   Using this as alternative test product")
-                
-                return {
-                    'type': 'custom_range',
-                    'start_row': product.row_number,
-                    'end_row': product.row_number,
-                    'product_count': 1,
-                    'description': f'Row {product.row_number}: {product.name} (alternative test product)'
-                }
+        # If not found, fall back to the first similar pattern
+        if similar is not None:
+            print(f"\n⚡ Found similar test product: {similar.name} (Row {similar.row_number})")
+            print(f"   Using this as alternative test product")
+            
+            return {
+                'type': 'custom_range',
+                'start_row': similar.row_number,
+                'end_row': similar.row_number,
+                'product_count': 1,
+                'description': f'Row {similar.row_number}: {similar.name} (alternative test product)'
+            }
         
         print(f"\n⚠️  Could not find 'WD 150 3PH' product in the list")
         print(f"   Will use fallback method (first 2 products)")
@@ -481,16 +600,17 @@ class NaturalLanguageCLI:
     
     def _get_specific_test_rows(self, products_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Let user choose 2 specific rows for testing."""
-        available_rows = [p.row_number for p in products_info['products']]
-        min_row = min(available_rows)
-        max_row = max(available_rows)
+        available_rows = {p.row_number for p in products_info['products']}
+        # Products are read in sheet order, so the first/last rows are the bounds
+        min_row = products_info['first_row']
+        max_row = products_info['last_row']
         
         print(f"\n🔍 CHOOSE 2 SPECIFIC ROWS")
         print(f"   Available rows: {min_row} to {max_row}")
         
         # Show first few products as examples
         print(f"\n📋 Examples from your product list:")
-        for i, product in enumerate(products_info['products'][:8]):
+        for product in islice(products_info['products'], 8):
             print(f"   Row {product.row_number}: {product.name} (₪{product.original_price})")
         
         if len(products_info['products']) > 8:
@@ -499,8 +619,8 @@ class NaturalLanguageCLI:
         
         try:
             print(f"\n👉 Enter 2 row numbers to test:")
-            row1 = int(input(f"   First row ({min_row}-{max_row}): ").strip())
-            row2 = int(input(f"   Second row ({min_row}-{max_row}): ").strip())
+            row1 = int(self._prompt(f"   First row ({min_row}-{max_row}): ").strip())
+            row2 = int(self._prompt(f"   Second row ({min_row}-{max_row}): ").strip())
             
             # Validate rows
             if row1 not in available_rows or row2 not in available_rows:
@@ -530,16 +650,16 @@ class NaturalLanguageCLI:
     def get_custom_range(self, products_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Get custom row range from user."""
         total = products_info['total_products']
-        available_rows = [p.row_number for p in products_info['products']]
-        min_row = min(available_rows)
-        max_row = max(available_rows)
+        row_numbers = products_info.get('row_numbers') or sorted(p.row_number for p in products_info['products'])
+        min_row = row_numbers[0]
+        max_row = row_numbers[-1]
         
         print(f"\n🎯 Custom Range Selection")
         print(f"   Available rows: {min_row} to {max_row} ({total} products)")
         
         try:
-            start = input(f"👉 Start row (minimum {min_row}): ").strip()
-            end = input(f"👉 End row (maximum {max_row}): ").strip()
+            start = self._prompt(f"👉 Start row (minimum {min_row}): ").strip()
+            end = self._prompt(f"👉 End row (maximum {max_row}): ").strip()
             
             start_row = int(start)
             end_row = int(end)
@@ -548,16 +668,16 @@ class NaturalLanguageCLI:
                 print("❌ Invalid range")
                 return None
                 
-            # Count products in range
-            products_in_range = [p for p in products_info['products'] 
-                               if start_row <= p.row_number <= end_row]
+            # Count products in range (row numbers are sorted)
+            product_count = (bisect.bisect_right(row_numbers, end_row)
+                             - bisect.bisect_left(row_numbers, start_row))
             
             return {
                 'type': 'custom_range',
                 'start_row': start_row,
                 'end_row': end_row,
-                'product_count': len(products_in_range),
-                'description': f'Rows {start_row}-{end_row} ({len(products_in_range)} products)'
+                'product_count': product_count,
+                'description': f'Rows {start_row}-{end_row} ({product_count} products)'
             }
             
         except ValueError:
@@ -581,36 +701,40 @@ class NaturalLanguageCLI:
     
     def choose_scraping_mode(self, product_count: int) -> Optional[str]:
         """Let user choose scraping mode with smart recommendations."""
-        print(f"\n🖥️  SCRAPING MODE SELECTION")
-        print(f"   You're processing {product_count} product(s)")
+        lines = [
+            "\n🖥️  SCRAPING MODE SELECTION",
+            f"   You're processing {product_count} product(s)",
+        ]
         
         # Apply bulk processing restrictions
         if product_count > 10:
-            print(f"\n⚠️  BULK PROCESSING RESTRICTION:")
-            print(f"   Processing {product_count} products (>10) requires headless mode.")
-            print(f"   This ensures stability and optimal performance.")
+            lines.append("\n⚠️  BULK PROCESSING RESTRICTION:")
+            lines.append(f"   Processing {product_count} products (>10) requires headless mode.")
+            lines.append("   This ensures stability and optimal performance.")
+            sys.stdout.write("\n".join(lines) + "\n")
             
-            confirm = input("\n👉 Continue with headless mode? (Y/N): ").strip().lower()
+            confirm = self._prompt("\n👉 Continue with headless mode? (Y/N): ").strip().lower()
             if confirm in ['', 'y', 'yes']:
                 return 'headless'
             else:
                 return None
         
         # For ≤10 products, offer choices
-        print(f"\n🎛️  Available modes for {product_count} products:")
-        print("1. 👀 Explicit mode - Shows browser window (good for debugging)")
-        print("2. 🚀 Headless mode - No browser window (faster, uses less resources)")
-        print("3. 📱 Minimal mode - Browser window minimized")
+        lines.append(f"\n🎛️  Available modes for {product_count} products:")
+        lines.append("1. 👀 Explicit mode - Shows browser window (good for debugging)")
+        lines.append("2. 🚀 Headless mode - No browser window (faster, uses less resources)")
+        lines.append("3. 📱 Minimal mode - Browser window minimized")
         
         # Add recommendations
         if product_count <= 3:
-            print("\n💡 Recommendation: Explicit mode (best for testing/debugging)")
+            lines.append("\n💡 Recommendation: Explicit mode (best for testing/debugging)")
         elif product_count <= 6:
-            print("\n💡 Recommendation: Headless mode (good balance of speed/resources)")
+            lines.append("\n💡 Recommendation: Headless mode (good balance of speed/resources)")
         else:
-            print("\n💡 Recommendation: Headless mode (optimal for this batch size)")
+            lines.append("\n💡 Recommendation: Headless mode (optimal for this batch size)")
+        sys.stdout.write("\n".join(lines) + "\n")
         
-        choice = input("\n👉 Choose mode (1-3): ").strip()
+        choice = self._prompt("\n👉 Choose mode (1-3): ").strip()
         
         mode_map = {
             '1': 'explicit',
@@ -640,13 +764,13 @@ class NaturalLanguageCLI:
         print("2. 🎯 Custom filename in output/ directory")
         print("3. 📁 Custom full path")
         
-        choice = input("\n👉 Choose option (1-3): ").strip()
+        choice = self._prompt("\n👉 Choose option (1-3): ").strip()
         
         if choice == '1':
             return default_path
             
         elif choice == '2':
-            filename = input("📝 Enter filename (without .xlsx): ").strip()
+            filename = self._prompt("📝 Enter filename (without .xlsx): ").strip()
             if filename:
                 # Use absolute path for custom filename
                 output_dir = Path.cwd() / "output"
@@ -655,7 +779,7 @@ class NaturalLanguageCLI:
                 return default_path
                 
         elif choice == '3':
-            full_path = input("📁 Enter full path: ").strip()
+            full_path = self._prompt("📁 Enter full path: ").strip()
             if full_path:
                 return full_path
             else:
@@ -668,19 +792,20 @@ class NaturalLanguageCLI:
     def review_and_confirm_config(self, source_file: str, target_file: str, 
                                  row_selection: Dict[str, Any], mode: str) -> bool:
         """Review configuration and get final confirmation."""
-        print(f"\n" + "="*50)
-        print("📋 CONFIGURATION REVIEW")
-        print("="*50)
-        
-        print(f"📁 Source file: {source_file}")
-        print(f"🎯 Products: {row_selection['description']}")
-        print(f"🖥️  Mode: {mode}")
-        print(f"💾 Output: {target_file}")
-        print(f"⏱️  Estimated time: {self.estimate_processing_time(row_selection['product_count'])}")
-        
-        print(f"\n" + "-"*50)
+        lines = [
+            "\n" + SEPARATOR,
+            "📋 CONFIGURATION REVIEW",
+            SEPARATOR,
+            f"📁 Source file: {source_file}",
+            f"🎯 Products: {row_selection['description']}",
+            f"🖥️  Mode: {mode}",
+            f"💾 Output: {target_file}",
+            f"⏱️  Estimated time: {self.estimate_processing_time(row_selection['product_count'])}",
+            "\n" + DIVIDER,
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
         
-        confirm = input("👉 Everything looks good? Start scraping? (Y/N): ").strip().lower()
+        confirm = self._prompt("👉 Everything looks good? Start scraping? (Y/N): ").strip().lower()
         return confirm in ['', 'y', 'yes']
     
     def direct_scraping_execution(self, source_file: str, target_file: str,
@@ -700,7 +825,7 @@ class NaturalLanguageCLI:
             print(f"🎯 Mode: {mode}")
             
             # Setup configuration
-            config = Config("config/default_config.json" if os.path.exists("config/default_config.json") else None)
+            config = Config(_DEFAULT_CONFIG_PATH)
             
             # Setup logging
             log_level = config.get("logging.level", "INFO")
@@ -720,7 +845,7 @@ class NaturalLanguageCLI:
             
             # Read products from source
             print("📖 Reading products from source Excel...")
-            products = self.scraper_service.get_source_products(source_file)
+            products = self._get_source_products(source_file)
             print(f"✅ Found {len(products)} products")
             
             # Apply row range filter if specified
@@ -960,7 +1085,7 @@ class NaturalLanguageCLI:
             except Exception as e:
                 print(f"\n❌ Error executing scraping: {e}")
             
-        input("\nPress Enter to continue...")
+        self._prompt("\nPress Enter to continue...")
     
     def quick_test_scraping(self):
         """Quick test scraping setup."""
@@ -968,8 +1093,8 @@ class NaturalLanguageCLI:
         print("Perfect for fast validation and debugging!")
         
         # Use defaults with minimal configuration
-        source_file = "data/SOURCE.xlsx"
-        if not os.path.exists(source_file):
+        source_file = DEFAULT_SOURCE_FILE
+        if not _cached_exists(source_file):
             print(f"❌ Default source file not found: {source_file}")
             return
             
@@ -1007,7 +1132,7 @@ class NaturalLanguageCLI:
         print(f"   💾 Output: {target_file}")
         print(f"   ⏱️  Estimated time: ~5 minutes (optimal test product)")
         
-        confirm = input("\n👉 Start quick test? (Y/N): ").strip().lower()
+        confirm = self._prompt("\n👉 Start quick test? (Y/N): ").strip().lower()
         if confirm in ['', 'y', 'yes']:
             self.execute_scraping_session(source_file, target_file, row_selection, 'explicit')
     
@@ -1045,7 +1170,7 @@ class NaturalLanguageCLI:
         
         while True:
             try:
-                user_input = input(f"👉 Enter count (default {suggested_count}): ").strip()
+                user_input = self._prompt(f"👉 Enter count (default {suggested_count}): ").strip()
                 if not user_input:
                     count = suggested_count
                     break
@@ -1084,7 +1209,7 @@ class NaturalLanguageCLI:
         print(f"   💾 Output: {target_file}")
         print(f"   ⏱️  Estimated time: ~{est_minutes:.0f} minutes")
         
-        confirm = input("\n👉 Start small batch scraping? (Y/N): ").strip().lower()
+        confirm = self._prompt("\n👉 Start small batch scraping? (Y/N): ").strip().lower()
         if confirm in ['', 'y', 'yes']:
             self.execute_scraping_session(source_file, target_file, row_selection, mode)
     
@@ -1121,7 +1246,7 @@ class NaturalLanguageCLI:
         print(f"B. Process first N products")
         print(f"C. Process custom row range")
         
-        scope_choice = input("\n👉 Choose scope (A/B/C): ").strip().upper()
+        scope_choice = self._prompt("\n👉 Choose scope (A/B/C): ").strip().upper()
         
         if scope_choice == 'A':
             row_selection = {
@@ -1133,7 +1258,7 @@ class NaturalLanguageCLI:
         elif scope_choice == 'B':
             while True:
                 try:
-                    count = int(input(f"👉 How many products to process? (max {total_products}): "))
+                    count = int(self._prompt(f"👉 How many products to process? (max {total_products}): "))
                     if 1 <= count <= total_products:
                         break
                     else:
@@ -1174,7 +1299,7 @@ class NaturalLanguageCLI:
         print(f"   ⏱️  Estimated time: ~{est_minutes:.0f} minutes")
         print(f"   🔥 This will run in background - you can use your computer normally")
         
-        confirm = input("\n👉 Start large batch scraping? (Y/N): ").strip().lower()
+        confirm = self._prompt("\n👉 Start large batch scraping? (Y/N): ").strip().lower()
         if confirm in ['', 'y', 'yes']:
             self.execute_scraping_session(source_file, target_file, row_selection, mode)
     
@@ -1209,7 +1334,7 @@ class NaturalLanguageCLI:
         print(f"B. 📍 Choose specific row number")
         print(f"C. 🔀 Use first product")
         
-        choice = input("\n👉 Choose option (A/B/C): ").strip().upper()
+        choice = self._prompt("\n👉 Choose option (A/B/C): ").strip().upper()
         
         if choice == 'A':
             # Try to find optimal test product
@@ -1227,7 +1352,7 @@ class NaturalLanguageCLI:
                 try:
                     first_row = products_info['first_row']
                     last_row = products_info['last_row']
-                    row_num = int(input(f"👉 Enter row number ({first_row}-{last_row}): "))
+                    row_num = int(self._prompt(f"👉 Enter row number ({first_row}-{last_row}): "))
                     if first_row <= row_num <= last_row:
                         row_selection = {
                             'type': 'custom_range',
@@ -1270,7 +1395,7 @@ class NaturalLanguageCLI:
         print(f"   💾 Output: {target_file}")
         print(f"   ⏱️  Estimated time: ~3-5 minutes")
         
-        confirm = input("\n👉 Start single product validation? (Y/N): ").strip().lower()
+        confirm = self._prompt("\n👉 Start single product validation? (Y/N): ").strip().lower()
         if confirm in ['', 'y', 'yes']:
             self.execute_scraping_session(source_file, target_file, row_selection, mode)
     
@@ -1314,7 +1439,7 @@ class NaturalLanguageCLI:
             print("3. Search results")
             print("4. Return to main menu")
             
-            choice = input("\n👉 Enter choice (1-4): ").strip()
+            choice = self._prompt("\n👉 Enter choice (1-4): ").strip()
             
             if choice == '1':
                 self._show_detailed_statistics()
@@ -1327,7 +1452,7 @@ class NaturalLanguageCLI:
             logger.error(f"Error in view_recent_results: {e}")
             print(f"❌ Error loading results: {e}")
             
-        input("\nPress Enter to continue...")
+        self._prompt("\nPress Enter to continue...")
     
     def system_status_check(self):
         """Check system status and performance."""
@@ -1386,7 +1511,7 @@ class NaturalLanguageCLI:
             print("2. View performance metrics")
             print("3. Return to main menu")
             
-            choice = input("\n👉 Enter choice (1-3): ").strip()
+            choice = self._prompt("\n👉 Enter choice (1-3): ").strip()
             
             if choice == '1':
                 self._run_comprehensive_health_check()
@@ -1397,7 +1522,7 @@ class NaturalLanguageCLI:
             logger.error(f"Error in system_status_check: {e}")
             print(f"❌ Error checking system status: {e}")
             
-        input("\nPress Enter to continue...")
+        self._prompt("\nPress Enter to continue...")
     
     def show_help_and_examples(self):
         """Show help and usage examples."""
@@ -1433,7 +1558,7 @@ class NaturalLanguageCLI:
         print("   • Check 'View recent results' to see past scraping")
         print("   • Use 'System status' if something seems wrong")
         
-        input("\nPress Enter to continue...")
+        self._prompt("\nPress Enter to continue...")
     
     def _is_file_path(self, input_str: str) -> bool:
         """Check if input string looks like a file path rather than a menu option."""
@@ -1514,7 +1639,7 @@ class NaturalLanguageCLI:
         my_drive_patterns = ["G:\\My Drive\\", "G:/My Drive/"]
         
         for pattern in my_drive_patterns:
-            if pattern in cleaned_path and not os.path.exists(cleaned_path):
+            if pattern in cleaned_path and not _cached_exists(cleaned_path):
                 # Only convert if main computer path doesn't exist
                 relative_path = cleaned_path.replace(pattern, "").replace('/', '\\')
                 external_format = f"C:\\Users\\USER\\Google Drive\\{relative_path}"
@@ -1554,11 +1679,11 @@ class NaturalLanguageCLI:
         # Check if file exists with different extension
         if file_path.endswith('.xlsx'):
             xls_path = file_path.replace('.xlsx', '.xls')
-            if os.path.exists(xls_path):
+            if _cached_exists(xls_path):
                 suggestions.append(f"File exists with .xls extension: {xls_path}")
         elif file_path.endswith('.xls'):
             xlsx_path = file_path.replace('.xls', '.xlsx')
-            if os.path.exists(xlsx_path):
+            if _cached_exists(xlsx_path):
                 suggestions.append(f"File exists with .xlsx extension: {xlsx_path}")
         
         # Check if relative path works
@@ -1570,7 +1695,7 @@ class NaturalLanguageCLI:
                 filename
             ]
             for candidate in relative_candidates:
-                if os.path.exists(candidate):
+                if _cached_exists(candidate):
                     suggestions.append(f"File found using relative path: {candidate}")
                     break
         
@@ -1578,7 +1703,7 @@ class NaturalLanguageCLI:
         if not file_path.startswith("data/"):
             filename = os.path.basename(file_path)
             data_path = f"data/{filename}"
-            if os.path.exists(data_path):
+            if _cached_exists(data_path):
                 suggestions.append(f"File found in data directory: {data_path}")
         
         return suggestions
@@ -1621,7 +1746,7 @@ class NaturalLanguageCLI:
             for i, result in enumerate(results, 1):
                 print(f"{i}. {result['filename']}")
             
-            choice = input(f"\n👉 Enter file number (1-{len(results)}): ").strip()
+            choice = self._prompt(f"\n👉 Enter file number (1-{len(results)}): ").strip()
             
             try:
                 file_index = int(choice) - 1
@@ -1642,7 +1767,7 @@ class NaturalLanguageCLI:
     def _search_results(self):
         """Search through results."""
         try:
-            search_term = input("\n🔍 Enter search term (row number, product name, etc.): ").strip()
+            search_term = self._prompt("\n🔍 Enter search term (row number, product name, etc.): ").strip()
             
             if not search_term:
                 print("❌ Search term cannot be empty")
@@ -88,14 +88,22 @@ class SourceExcelReader:
         empty_rows = 0
         max_empty_rows = 5  # Stop after 5 consecutive empty rows
         
+        # Bind hot-loop lookups once instead of resolving them per cell
+        _cell = worksheet.cell
+        max_row = worksheet.max_row
+        col_manufacturer = self.col_manufacturer
+        col_model_series = self.col_model_series
+        col_model_number = self.col_model_number
+        col_original_price = self.col_original_price
+        
         # Start reading from the configured row
-        for row_idx in range(self.start_row, worksheet.max_row + 1):
+        for row_idx in range(self.start_row, max_row + 1):
             try:
                 # Get cell values from NEW Hebrew structure
-                manufacturer = worksheet.cell(row=row_idx, column=self.col_manufacturer).value
-                model_series = worksheet.cell(row=row_idx, column=self.col_model_series).value  
-                model_number = worksheet.cell(row=row_idx, column=self.col_model_number).value
-                original_price = worksheet.cell(row=row_idx, column=self.col_original_price).value
+                manufacturer = _cell(row_idx, col_manufacturer).value
+                model_series = _cell(row_idx, col_model_series).value
+                model_number = _cell(row_idx, col_model_number).value
+                original_price = _cell(row_idx, col_original_price).value
                 
                 # Check if row is empty (any of the main components missing)
                 if not manufacturer or not model_series or not model_number:
@@ -185,9 +193,10 @@ class SourceExcelReader:
             
             # Check if we have data at the start row (NEW structure validation)
             has_data = False
+            _cell = worksheet.cell
             for row_idx in range(self.start_row, min(self.start_row + 10, worksheet.max_row + 1)):
-                manufacturer = worksheet.cell(row=row_idx, column=self.col_manufacturer).value
-                model_series = worksheet.cell(row=row_idx, column=self.col_model_series).value
+                manufacturer = _cell(row_idx, self.col_manufacturer).value
+                model_series = _cell(row_idx, self.col_model_series).value
                 if manufacturer and model_series:
                     has_data = True
                     break